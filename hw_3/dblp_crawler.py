@@ -0,0 +1,170 @@
+"""DBLP 会议论文页的并发爬取：(会议, 年份) 组合放进线程池，共用一个保持长连接的 Session
+
+- 请求带 gzip 压缩、超时，429/5xx 和网络异常按指数退避重试（优先遵守 Retry-After）
+- 同一主机按令牌桶限速，线程再多也不会超过 rate 个请求/秒
+- 哪一页先下载完就先解析、先产出；404 等失败的页面跳过
+
+HostRateLimiter 和 retry_delay 与 no2/polite_http.py 的 HostRateLimiter、RetryPolicy.delay 规则相同
+（令牌桶按主机限速；Retry-After 优先，否则指数退避加 0.5~1 倍随机抖动，最长 max_backoff 秒）。
+各作业目录是独立运行的脚本集合，在各自目录下执行、互不导入，所以这里保留一份相同的实现；
+修改其中一份时另一份要同步修改。
+
+用法：
+    for conf, year, papers in crawl_venues(['ijcai', 'cvpr', 'aaai'], 2020, 2025, parse=parse_papers_from_year_page):
+        ...
+    # 离线测试时把 base_url 设为 dblp_stand_in 的地址
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = 'https://dblp.uni-trier.de'
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 64 * 1024
+
+
+def year_url(conf_name, year, base_url=BASE_URL):
+    """某会议某年论文列表页的地址"""
+    return f"{base_url}/db/conf/{conf_name}/{conf_name}{year}.html"
+
+
+def make_session(pool_size=8):
+    """共用的 Session：连接池大小与线程数一致，连接保持复用"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class HostRateLimiter:
+    """按主机限速：同一主机每秒最多rate个请求（令牌桶，最多积攒burst个），线程安全
+
+    与 no2/polite_http.HostRateLimiter 相同，只有默认速率不同（DBLP 要求更慢）。
+    """
+
+    def __init__(self, rate=1.0, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._next_free = {}  # 主机 -> 下一个可用发送时刻
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """阻塞到该主机允许发送下一个请求为止"""
+        host = urlparse(url).netloc
+        interval = 1.0 / self.rate
+        with self._lock:
+            now = time.monotonic()
+            # 空闲时最多可以提前burst个间隔，即允许短时突发
+            slot = max(self._next_free.get(host, now), now - (self.burst - 1) * interval)
+            self._next_free[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def retry_delay(attempt, response=None, backoff=1.0, max_backoff=30.0):
+    """第 attempt 次（从0开始）失败后等待的秒数：有 Retry-After 时照办，否则指数退避加随机抖动"""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), max_backoff)
+    return min(backoff * 2 ** attempt, max_backoff) * random.uniform(0.5, 1.0)
+
+
+def open_page(session, url, limiter=None, retries=3, timeout=30, stream=False):
+    """限速 + 重试地请求一个页面，返回状态码为200的响应；失败（重试用尽后）返回 None
+
+    stream=True 时响应体还没有下载，调用方用 iter_content 分块读取，读完后关闭响应。
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.wait(url)
+        try:
+            r = session.get(url, timeout=timeout, stream=stream)
+        except requests.RequestException as e:
+            if attempt == retries:
+                print(f"抓取失败：{url}（{e}），跳过该页")
+                return None
+            time.sleep(retry_delay(attempt))
+            continue
+        if r.status_code in RETRY_STATUSES and attempt < retries:
+            r.close()
+            print(f"{url} 返回 {r.status_code}，第{attempt + 1}次重试")
+            time.sleep(retry_delay(attempt, r))
+            continue
+        if r.status_code != 200:
+            r.close()
+            print(f"抓取失败，状态码：{r.status_code}，跳过该页：{url}")
+            return None
+        return r
+    return None
+
+
+def get_html(session, url, limiter=None, retries=3, timeout=30):
+    """抓取一个页面的完整文本，失败返回 None"""
+    r = open_page(session, url, limiter, retries, timeout)
+    return r.text if r is not None else None
+
+
+def crawl_venues(conferences, start_year=2020, end_year=2025, parse=None, stream=False, max_workers=6, rate=1.0,
+                 burst=2, retries=3, timeout=30, base_url=BASE_URL):
+    """并发抓取 会议 × 年份 的全部页面，按完成顺序产出 (会议, 年份, 结果)
+
+    parse(html, year, conf_name) 在下载线程中调用，结果即为它的返回值；parse=None 时结果为页面文本。
+    stream=True 时传给 parse 的不是整页文本，而是边下载边产出的字节块（已解压），页面不会整体留在内存里；
+    读取中途连接中断（ChunkedEncodingError、读超时等）时整页重新请求，parse 会被再次调用，
+    所以它应当在出错时清理自己写了一半的输出。
+    抓取失败的页面不产出。
+    """
+    jobs = [(conf, year) for conf in conferences for year in range(end_year, start_year - 1, -1)]
+    session = make_session(max_workers)
+    limiter = HostRateLimiter(rate, burst)
+
+    def fetch(job):
+        conf, year = job
+        url = year_url(conf, year, base_url)
+        print(f"正在抓取页面: {url}")
+        for attempt in range(retries + 1):
+            r = open_page(session, url, limiter, retries, timeout, stream=stream)
+            if r is None:
+                return None
+            try:
+                with r:
+                    if stream and parse is not None:
+                        return parse(r.iter_content(CHUNK_SIZE), year, conf)
+                    html = r.text
+            except requests.RequestException as e:
+                if attempt == retries:
+                    print(f"读取页面中断：{url}（{e}），跳过该页")
+                    return None
+                print(f"读取页面中断：{url}（{e}），第{attempt + 1}次重试")
+                time.sleep(retry_delay(attempt))
+                continue
+            return html if parse is None else parse(html, year, conf)
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch, job): job for job in jobs}
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None:
+                conf, year = futures[future]
+                yield conf, year, result
+
+
+def crawl_conference_years(conferences, start_year=2020, end_year=2025, parse=None, **kwargs):
+    """并发抓取后按原来的顺序整理：{会议: [该会议从 end_year 到 start_year 各年的论文...]}"""
+    pages = {(conf, year): papers for conf, year, papers in crawl_venues(conferences, start_year, end_year, parse,
+                                                                          **kwargs)}
+    return {conf: [paper for year in range(end_year, start_year - 1, -1) for paper in pages.get((conf, year), [])]
+            for conf in conferences}
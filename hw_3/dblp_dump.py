@@ -0,0 +1,84 @@
+"""从本地下载的 DBLP 数据集（dblp.xml.gz）导出会议论文，代替逐页抓取
+
+https://dblp.org/xml/ 下载 dblp.xml.gz 和 dblp.dtd 放在同一目录（DTD 定义了标题、人名里的
+&uuml; 这类实体）。用 lxml.etree.iterparse 顺序读取压缩文件，只在每条记录结束时处理，
+处理完立即释放，几 GB 的文件也只占用常数内存；按 key 前缀（conf/ijcai/、conf/cvpr/ ...）
+和年份范围筛选 inproceedings，产出与 save_papers_to_csv 相同的字段（title, authors, year, conference, link）。
+
+用法：
+    counts = dump_to_csv('dblp.xml.gz', ['ijcai', 'cvpr', 'aaai'], 2020, 2025)   # 写出 {会议}_papers_2020_2025.csv
+"""
+import csv
+import gzip
+
+from lxml import etree
+
+from dblp_parser import FIELDNAMES, fix_conference_spacing
+
+# dblp.xml 中所有顶层记录的类型；只在这些元素结束时回调，作者、标题等子元素不产生Python层面的事件
+RECORD_TAGS = ('article', 'inproceedings', 'proceedings', 'book', 'incollection',
+               'phdthesis', 'mastersthesis', 'www', 'person', 'data')
+
+
+def _text(element):
+    return ''.join(element.itertext()).strip()
+
+
+def _open(path):
+    return gzip.open(path, 'rb') if str(path).endswith('.gz') else open(path, 'rb')
+
+
+def iter_dump_papers(path, venues, start_year=2020, end_year=2025, proceedings_only=True):
+    """逐篇产出 (会议, 论文记录)
+
+    venues 为会议 key 名（'ijcai'、'cvpr' ...）；proceedings_only=True 时只保留正会论文集
+    （记录的 url 指向 db/conf/{会议}/{会议}{年份}.html，即与抓取的年份页相同），不含 workshop 等附属论文集。
+    link 取第一个 ee（电子版链接），与年份页中每篇论文的第一个链接一致。
+    """
+    prefixes = {f'conf/{venue}/': venue for venue in venues}
+    with _open(path) as f:
+        # DTD 与数据文件放在同一目录，lxml 按文件名找到它并展开实体
+        context = etree.iterparse(f, events=('end',), tag=RECORD_TAGS, load_dtd=True, resolve_entities=True,
+                                  huge_tree=True)
+        for _, element in context:
+            if element.tag == 'inproceedings':
+                key = element.get('key', '')
+                venue = prefixes.get(key[:key.find('/', 5) + 1])
+                year = element.findtext('year')
+                if venue and year and year.isdigit() and start_year <= int(year) <= end_year and (
+                        not proceedings_only
+                        or element.findtext('url', '').split('#')[0] == f'db/conf/{venue}/{venue}{year}.html'):
+                    title = element.find('title')
+                    yield venue, {
+                        'title': _text(title) if title is not None else "",
+                        'authors': [_text(author) for author in element.iterfind('author')],
+                        'year': year,
+                        'conference': fix_conference_spacing(f"{venue.upper()} {year}"),
+                        'link': element.findtext('ee', ''),
+                    }
+            # 处理完即释放：清空记录本身，并删掉根节点下已处理过的兄弟节点
+            element.clear()
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def dump_to_csv(path, venues, start_year=2020, end_year=2025, filename='{conf}_papers_{start}_{end}.csv',
+                proceedings_only=True):
+    """从数据集导出每个会议的CSV（格式与 save_papers_to_csv 相同，行按数据集中的顺序），返回 {会议: 论文数}"""
+    targets = {venue: filename.format(conf=venue, start=start_year, end=end_year) for venue in venues}
+    files = {venue: open(target, 'w', encoding='utf-8', newline='') for venue, target in targets.items()}
+    try:
+        writers = {venue: csv.DictWriter(f, fieldnames=FIELDNAMES) for venue, f in files.items()}
+        for writer in writers.values():
+            writer.writeheader()
+        counts = {venue: 0 for venue in venues}
+        for venue, paper in iter_dump_papers(path, venues, start_year, end_year, proceedings_only):
+            writers[venue].writerow({**paper, 'authors': '; '.join(paper['authors'])})
+            counts[venue] += 1
+    finally:
+        for f in files.values():
+            f.close()
+    for venue, target in targets.items():
+        print(f"成功保存 {counts[venue]} 篇论文到文件：{target}")
+    return counts
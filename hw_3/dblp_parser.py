@@ -0,0 +1,135 @@
+"""DBLP 年份页的流式解析：边下载边解析，逐篇产出论文，直接写入CSV
+
+整页 BeautifulSoup 建树时，一个上万篇论文的页面要在内存里同时保留整棵树和全部结果；
+这里用 lxml 的 HTMLPullParser 按块喂入页面，每解析完一个 li.entry.inproceedings 就产出一条记录，
+随即清掉这个条目和它之前的兄弟节点，内存占用与页面大小无关。
+产出的字段与 parse_papers_from_year_page 相同（title, authors, year, conference, link）。
+
+用法：
+    counts = crawl_to_csv(['ijcai', 'cvpr', 'aaai'], 2020, 2025)   # 写出 {会议}_papers_2020_2025.csv
+"""
+import csv
+import os
+import re
+import shutil
+
+from lxml import etree
+
+from dblp_crawler import crawl_venues
+
+FIELDNAMES = ['title', 'authors', 'year', 'conference', 'link']
+ENTRY_CLASS = 'entry inproceedings'
+TITLE_PATH = etree.XPath('.//span[contains(concat(" ", normalize-space(@class), " "), " title ")]')
+AUTHOR_PATH = etree.XPath('.//span[@itemprop="author"]')
+NAME_PATH = etree.XPath('.//span[@itemprop="name"]')
+LINK_PATH = etree.XPath('.//a[@href]')
+
+
+def fix_conference_spacing(name):
+    # 修正会议名称中的空格问题
+    name = re.sub(r'(\d+(?:st|nd|rd|th))([A-Z])', r'\1 \2', name)
+    name = re.sub(r'([A-Za-z])(\d{4})', r'\1 \2', name)
+    return name
+
+
+def _text(element):
+    return ''.join(element.itertext()).strip()
+
+
+def _entry_record(entry, year, conference_name):
+    titles = TITLE_PATH(entry)
+    authors = []
+    for author in AUTHOR_PATH(entry):
+        names = NAME_PATH(author)
+        if names:
+            authors.append(_text(names[0]))
+    links = LINK_PATH(entry)
+    return {
+        'title': _text(titles[0]) if titles else "",
+        'authors': authors,
+        'year': str(year),
+        'conference': conference_name,
+        'link': links[0].get('href') if links else "",
+    }
+
+
+def iter_papers(chunks, year, conf_name):
+    """逐篇产出论文记录；chunks 为页面的字节块（或一整块 bytes/str）"""
+    if isinstance(chunks, (bytes, str)):
+        chunks = [chunks.encode('utf-8') if isinstance(chunks, str) else chunks]
+    conference_name = fix_conference_spacing(f"{conf_name.upper()} {year}")
+    parser = etree.HTMLPullParser(events=('end',), tag='li', encoding='utf-8')
+
+    def entries():
+        for _, element in parser.read_events():
+            if element.get('class') != ENTRY_CLASS:
+                continue
+            yield _entry_record(element, year, conference_name)
+            # 处理完即释放：清空条目本身，并删掉同一列表中已处理过的兄弟节点
+            element.clear()
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from entries()
+    parser.close()
+    yield from entries()
+
+
+def write_papers(papers, f, header=True):
+    """把论文记录逐条写入已打开的CSV文件（authors 列表用 "; " 连接，不修改传入的记录），返回条数"""
+    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+    if header:
+        writer.writeheader()
+    count = 0
+    for paper in papers:
+        writer.writerow({**paper, 'authors': '; '.join(paper['authors'])})
+        count += 1
+    return count
+
+
+def crawl_to_csv(conferences, start_year=2020, end_year=2025, filename='{conf}_papers_{start}_{end}.csv', **kwargs):
+    """并发抓取并流式解析，每个会议写出一个CSV，返回 {会议: 论文数}；其余参数同 crawl_venues
+
+    每页下载时直接写入自己的分片文件，全部完成后按年份从新到旧拼接成最终文件，
+    行的顺序与原来先收集列表再 save_papers_to_csv 的结果相同。
+    """
+    def part_path(conf, year):
+        return filename.format(conf=conf, start=start_year, end=end_year) + f'.{year}.part'
+
+    def parse_to_part(chunks, year, conf):
+        # 下载中断时删掉写了一半的分片，重试或跳过该页都不会留下残缺的数据
+        path = part_path(conf, year)
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                return write_papers(iter_papers(chunks, year, conf), f, header=False)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    # 清掉上次中断留下的分片，这次抓取失败的页面不会混入旧数据
+    for conf in conferences:
+        for year in range(end_year, start_year - 1, -1):
+            if os.path.exists(part_path(conf, year)):
+                os.remove(part_path(conf, year))
+
+    counts = {conf: 0 for conf in conferences}
+    for conf, year, count in crawl_venues(conferences, start_year, end_year, parse=parse_to_part, stream=True,
+                                          **kwargs):
+        counts[conf] += count
+
+    for conf in conferences:
+        target = filename.format(conf=conf, start=start_year, end=end_year)
+        with open(target, 'w', encoding='utf-8', newline='') as out:
+            csv.DictWriter(out, fieldnames=FIELDNAMES).writeheader()
+            for year in range(end_year, start_year - 1, -1):
+                path = part_path(conf, year)
+                if os.path.exists(path):
+                    with open(path, encoding='utf-8', newline='') as part:
+                        shutil.copyfileobj(part, out)
+                    os.remove(path)
+        print(f"成功保存 {counts[conf]} 篇论文到文件：{target}")
+    return counts
@@ -0,0 +1,212 @@
+"""本地 DBLP 替身站点：按 /db/conf/{会议}/{会议}{年份}.html 返回论文列表页，用于离线测试爬虫
+
+fixtures 目录下有 {会议}{年份}.html 时原样返回（可以放真实保存下来的 DBLP 页面），
+否则用 {会议}_papers_*.csv（save_papers_to_csv 的输出）中该年的论文生成结构与 DBLP 相同的页面，
+两者都没有时返回404。请求带 Accept-Encoding: gzip 时压缩返回。
+write_fixture_dump 用同样的CSV生成一个小型的 dblp.xml.gz + dblp.dtd，用于测试 dblp_dump。
+
+用法：
+    python dblp_stand_in.py [fixtures目录] [端口]
+    # 然后把爬虫的 base_url 设为 'http://127.0.0.1:8767'
+"""
+import csv
+import gzip
+import html
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from html.entities import codepoint2name
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PATH_PATTERN = re.compile(r'^/db/conf/(\w+)/\1(\d{4})\.html$')
+ENTRY_TEMPLATE = (
+    '<li class="entry inproceedings" id="conf/{conf}/{key}" itemscope itemtype="http://schema.org/ScholarlyArticle">'
+    '<link itemprop="additionalType" href="https://dblp.org/rdf/schema#Publication">'
+    '<div class="box"><img alt="" title="Conference and Workshop Papers" src="https://dblp.uni-trier.de/img/n.png"></div>'
+    '<nav class="publ"><ul><li class="drop-down"><div class="head"><a href="{link}">'
+    '<img alt="" src="https://dblp.uni-trier.de/img/paper.dark.hollow.16x16.png" class="icon"></a></div>'
+    '<div class="body"><p><b>view</b></p><ul><li class="ee"><a href="{link}" itemprop="url">electronic edition via DOI</a></li>'
+    '</ul></div></li><li class="drop-down"><div class="head">'
+    '<a href="https://dblp.uni-trier.de/rec/conf/{conf}/{key}.html?view=bibtex">'
+    '<img alt="" src="https://dblp.uni-trier.de/img/download.dark.hollow.16x16.png" class="icon"></a></div>'
+    '<div class="body"><p><b>export record</b></p><ul>'
+    '<li><a href="https://dblp.uni-trier.de/rec/conf/{conf}/{key}.html?view=bibtex">BibTeX</a></li>'
+    '<li><a href="https://dblp.uni-trier.de/rec/conf/{conf}/{key}.ris">RIS</a></li></ul></div></li></ul></nav>'
+    '<cite class="data tts-content" itemprop="headline">{authors}:<br> '
+    '<span class="title" itemprop="name">{title}</span> '
+    '<a href="https://dblp.uni-trier.de/db/conf/{conf}/{conf}{year}.html#{key}">'
+    '<span itemprop="isPartOf" itemscope itemtype="http://schema.org/BookSeries">'
+    '<span itemprop="name">{venue}</span></span> <span itemprop="datePublished">{year}</span></a>'
+    ': <span itemprop="pagination">{first}-{last}</span></cite></li>'
+)
+AUTHOR_TEMPLATE = (
+    '<span itemprop="author" itemscope itemtype="http://schema.org/Person">'
+    '<a href="https://dblp.uni-trier.de/pid/{pid}.html" itemprop="url">'
+    '<span itemprop="name" title="{name}">{name}</span></a></span>'
+)
+
+
+def load_papers(directory):
+    """读取目录下 {会议}_papers_*.csv，返回 {(会议, 年份): [论文行, ...]}（保持文件中的顺序）"""
+    papers = defaultdict(list)
+    for path in sorted(Path(directory).glob('*_papers_*.csv')):
+        conf = path.name.split('_papers_')[0]
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                papers[conf, int(row['year'])].append(row)
+    return dict(papers)
+
+
+def synthetic_year_page(conf, year, rows):
+    """用论文行生成一个 DBLP 年份页面：开头是论文集本身的 editor 条目，每200篇一个分节"""
+    rng = random.Random(f"{conf}{year}")
+    venue = conf.upper()
+    parts = [f'<html><head><meta charset="utf-8"><title>dblp: {venue} {year}</title></head><body>'
+             f'<div id="main"><header class="h2"><h2>{venue} {year}</h2></header>'
+             f'<ul class="publ-list"><li class="entry editor" id="conf/{conf}/{year}">'
+             f'<cite class="data"><span class="title" itemprop="name">Proceedings of {venue} {year}</span></cite></li></ul>']
+    for start in range(0, len(rows), 200):
+        parts.append(f'<header class="h2"><h2>Session {start // 200 + 1}</h2></header><ul class="publ-list">')
+        for i, row in enumerate(rows[start:start + 200], start):
+            names = [name for name in row['authors'].split('; ') if name]
+            authors = ', '.join(AUTHOR_TEMPLATE.format(pid=f"{rng.randrange(10, 400)}/{rng.randrange(1000, 9999)}",
+                                                       name=html.escape(name)) for name in names)
+            first = rng.randrange(1, 9000)
+            parts.append(ENTRY_TEMPLATE.format(
+                conf=conf, key=f"{conf.capitalize()}{year % 100:02d}{i}", year=year, venue=venue,
+                link=html.escape(row['link']), title=html.escape(row['title']), authors=authors,
+                first=first, last=first + rng.randrange(6, 12)))
+        parts.append('</ul>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def _xml_text(text):
+    """按 dblp.xml 的写法转义：Latin-1 字符写成 &uuml; 这类命名实体（由 DTD 定义），其余非ASCII字符写成数字引用"""
+    out = []
+    for char in html.escape(text, quote=False):
+        code = ord(char)
+        if code < 128:
+            out.append(char)
+        elif code < 256 and code in codepoint2name:
+            out.append(f'&{codepoint2name[code]};')
+        else:
+            out.append(f'&#{code};')
+    return ''.join(out)
+
+
+def write_fixture_dump(directory, papers_dir=None, per_year=None):
+    """在 directory 下写出 dblp.xml.gz 和 dblp.dtd；per_year 限制每个会议每年的论文数（None 为全部）
+
+    除了各会议正会论文外，还混入 DBLP 中常见的其他记录：期刊论文、个人主页（www）、
+    论文集本身（proceedings）和 workshop 论文（url 指向 {会议}w{年份}.html），用来检验筛选条件。
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    entities = ''.join(f'<!ENTITY {name} "&#{code};">\n' for code, name in sorted(codepoint2name.items())
+                       if 160 <= code < 256)
+    (directory / 'dblp.dtd').write_text(
+        '<!ELEMENT dblp (article|inproceedings|proceedings|www)*>\n' + entities, encoding='utf-8')
+    papers = load_papers(papers_dir or Path(__file__).parent)
+    with gzip.open(directory / 'dblp.xml.gz', 'wt', encoding='iso-8859-1') as f:
+        f.write('<?xml version="1.0" encoding="ISO-8859-1"?>\n<!DOCTYPE dblp SYSTEM "dblp.dtd">\n<dblp>\n')
+        f.write('<article key="journals/ai/Smith20" mdate="2020-01-01"><author>John Smith</author>'
+                '<title>A Journal Paper.</title><year>2020</year><journal>Artif. Intell.</journal></article>\n')
+        for (conf, year), rows in sorted(papers.items()):
+            f.write(f'<proceedings key="conf/{conf}/{year}" mdate="{year}-12-01"><editor>Jane Doe</editor>'
+                    f'<title>Proceedings of {conf.upper()} {year}</title><year>{year}</year></proceedings>\n')
+            for i, row in enumerate(rows[:per_year]):
+                authors = ''.join(f'<author>{_xml_text(name)}</author>' for name in row['authors'].split('; ') if name)
+                f.write(f'<inproceedings key="conf/{conf}/{conf.capitalize()}{year % 100:02d}{i}" mdate="{year}-12-01">'
+                        f'{authors}<title>{_xml_text(row["title"])}</title><pages>{i + 1}-{i + 9}</pages>'
+                        f'<year>{year}</year><booktitle>{conf.upper()}</booktitle>'
+                        f'<ee>{_xml_text(row["link"])}</ee><ee type="oa">https://example.org/{conf}/{year}/{i}</ee>'
+                        f'<crossref>conf/{conf}/{year}</crossref><url>db/conf/{conf}/{conf}{year}.html#{i}</url>'
+                        f'</inproceedings>\n')
+            f.write(f'<inproceedings key="conf/{conf}/W{year % 100:02d}" mdate="{year}-12-01"><author>Ann Lee</author>'
+                    f'<title>A Workshop Paper.</title><year>{year}</year><booktitle>{conf.upper()} Workshops</booktitle>'
+                    f'<url>db/conf/{conf}/{conf}w{year}.html#W</url></inproceedings>\n')
+            f.write(f'<www key="homepages/{year}/{conf}" mdate="{year}-12-01"><author>Ann Lee</author>'
+                    f'<title>Home Page</title></www>\n')
+        f.write('</dblp>\n')
+
+
+def make_server(fixtures=None, papers_dir=None, port=0, delay=0.0, error_rate=0.0, seed=0):
+    """创建替身站点（未启动）。papers_dir 默认为本文件所在目录（即仓库中已有的论文CSV）
+
+    delay 模拟网络延迟（秒）；error_rate 按概率返回429，用于测试重试；
+    server.hits 统计每个路径被请求的次数，server.bytes_sent 统计实际发送的字节数。
+    """
+    fixtures = Path(fixtures) if fixtures else None
+    papers = load_papers(papers_dir or Path(__file__).parent)
+    pages = {}  # 生成的页面缓存
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def page_body(conf, year):
+        saved = fixtures / f"{conf}{year}.html" if fixtures else None
+        if saved is not None and saved.exists():
+            return saved.read_bytes()
+        if (conf, year) not in papers:
+            return None
+        with lock:
+            if (conf, year) not in pages:
+                pages[conf, year] = synthetic_year_page(conf, year, papers[conf, year]).encode('utf-8')
+            return pages[conf, year]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                server.hits[self.path] += 1
+                throttled = rng.random() < error_rate
+            if delay:
+                time.sleep(delay)
+            match = PATH_PATTERN.match(self.path)
+            body = page_body(match.group(1), int(match.group(2))) if match and not throttled else None
+            if throttled:
+                self._send(429, b'', {'Retry-After': '0'})
+            elif body is None:
+                self._send(404, b'not found')
+            elif 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self._send(200, gzip.compress(body, compresslevel=5), {'Content-Encoding': 'gzip'})
+            else:
+                self._send(200, body)
+
+        def _send(self, status, body, headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                server.bytes_sent += len(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    server.hits = Counter()
+    server.bytes_sent = 0
+    return server
+
+
+def serve_in_thread(**kwargs):
+    """在后台线程启动替身站点，返回 (server, base_url)；用完调用 server.shutdown()"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == '__main__':
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8767
+    print(f"DBLP 替身站点：http://127.0.0.1:{port}")
+    make_server(fixtures_dir, port=port).serve_forever()
@@ -0,0 +1,124 @@
+"""按 (会议, 年份) 预先统计的标题 n-gram（1~3 元）计数索引，存放在论文库中
+
+论文入库时对新论文的标题分词一次（小写、去标点、去停用词和长度不超过2的词，与词云的规则相同），
+n-gram 统一编号存入 ngram_vocab 表；每个 (会议, 年份, n) 的计数存成一条稀疏向量
+（编号和计数两个 int32 数组，以二进制保存）。任意年份范围、任意会议组合的词频就是把对应的
+几条向量相加（np.bincount），不需要再扫描、切分全部标题；新的年份或新论文入库时只更新受影响的向量。
+
+n-gram 只在同一标题内部统计，不跨越相邻两个标题。
+
+用法（PaperCorpus 入库时自动维护，corpus.ngrams 即为本索引）：
+    corpus.ngrams.counts(2, start_year=2020, end_year=2022)   # Counter：二元短语 -> 出现次数
+    corpus.ngrams.counts(1, venues=['cvpr'])
+"""
+import string
+from collections import Counter, defaultdict
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# 停用词集合（英文+自定义）
+STOP_WORDS = set(ENGLISH_STOP_WORDS) | {'february'}
+MAX_N = 3
+PUNCTUATION = str.maketrans('', '', string.punctuation)
+
+
+def tokenize(title):
+    words = title.lower().translate(PUNCTUATION).split()
+    return [w for w in words if w not in STOP_WORDS and len(w) > 2]
+
+
+def title_ngrams(title, max_n=MAX_N):
+    """标题中的全部 1~max_n 元短语：{n: [短语, ...]}"""
+    words = tokenize(title)
+    return {n: [' '.join(words[i:i + n]) for i in range(len(words) - n + 1)] for n in range(1, max_n + 1)}
+
+
+class NgramIndex:
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS ngram_vocab (
+                id INTEGER PRIMARY KEY,
+                n INTEGER NOT NULL,
+                text TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS ngram_counts (
+                venue TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                ids BLOB NOT NULL,
+                counts BLOB NOT NULL,
+                PRIMARY KEY (venue, year, n)
+            );
+        ''')
+        self._vocab = None  # 短语 -> 编号，第一次使用时读入
+        self._texts = None  # 编号 -> 短语
+
+    def reset(self):
+        """丢弃内存中的词表，下次使用时从数据库重新读入；调用方的事务回滚后必须调用，否则会留下回滚掉的编号"""
+        self._vocab = None
+        self._texts = None
+
+    def _load_vocab(self):
+        if self._vocab is None:
+            rows = self.conn.execute('SELECT id, text FROM ngram_vocab').fetchall()
+            self._vocab = {text: ngram_id for ngram_id, text in rows}
+            self._texts = {ngram_id: text for ngram_id, text in rows}
+
+    def _ids(self, n, phrases):
+        """短语的编号，新短语写入词表"""
+        self._load_vocab()
+        new = [phrase for phrase in phrases if phrase not in self._vocab]
+        for phrase in new:
+            ngram_id = self.conn.execute('INSERT INTO ngram_vocab (n, text) VALUES (?, ?)', (n, phrase)).lastrowid
+            self._vocab[phrase] = ngram_id
+            self._texts[ngram_id] = phrase
+        return np.fromiter((self._vocab[phrase] for phrase in phrases), dtype=np.int32, count=len(phrases))
+
+    def add_titles(self, titles):
+        """把新论文的标题计入索引：titles 为 [(会议, 年份, 标题), ...]；调用方负责事务，回滚时调用 reset()"""
+        batch = defaultdict(Counter)
+        for venue, year, title in titles:
+            for n, phrases in title_ngrams(title).items():
+                batch[venue, int(year), n].update(phrases)
+        for (venue, year, n), counter in batch.items():
+            if not counter:
+                continue
+            ids = self._ids(n, list(counter))
+            counts = np.fromiter(counter.values(), dtype=np.int32, count=len(counter))
+            row = self.conn.execute('SELECT ids, counts FROM ngram_counts WHERE venue = ? AND year = ? AND n = ?',
+                                    (venue, year, n)).fetchone()
+            if row is not None:
+                ids = np.concatenate([np.frombuffer(row[0], dtype=np.int32), ids])
+                counts = np.concatenate([np.frombuffer(row[1], dtype=np.int32), counts])
+            # 合并同一编号的计数，按编号排序保存
+            ids, inverse = np.unique(ids, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts).astype(np.int32)
+            self.conn.execute('INSERT OR REPLACE INTO ngram_counts VALUES (?, ?, ?, ?, ?)',
+                              (venue, year, n, ids.tobytes(), counts.tobytes()))
+
+    def is_empty(self):
+        return self.conn.execute('SELECT 1 FROM ngram_counts LIMIT 1').fetchone() is None
+
+    def counts(self, n=2, venues=None, start_year=None, end_year=None):
+        """年份范围和会议（None 为全部）内 n 元短语的计数，返回 Counter"""
+        query, params = 'SELECT ids, counts FROM ngram_counts WHERE n = ?', [n]
+        if venues:
+            query += f" AND venue IN ({', '.join('?' * len(venues))})"
+            params += list(venues)
+        if start_year is not None:
+            query += ' AND year >= ?'
+            params.append(start_year)
+        if end_year is not None:
+            query += ' AND year <= ?'
+            params.append(end_year)
+        rows = self.conn.execute(query, params).fetchall()
+        if not rows:
+            return Counter()
+        ids = np.concatenate([np.frombuffer(row[0], dtype=np.int32) for row in rows])
+        weights = np.concatenate([np.frombuffer(row[1], dtype=np.int32) for row in rows])
+        totals = np.bincount(ids, weights=weights).astype(np.int64)
+        present = np.flatnonzero(totals)
+        self._load_vocab()
+        return Counter({self._texts[int(i)]: int(totals[i]) for i in present})
@@ -0,0 +1,234 @@
+"""本地论文库（SQLite）：papers / authors / paper_author 三张表，代替反复读取、拼接CSV
+
+- 去重：DOI 或链接相同即为同一篇；标题规范化（去重音、小写、只留字母数字）后同会议同年份相同，
+  且至少一方没有 DOI 时也视为同一篇（例如抓取的 ijcai.org 链接与数据集中的 DOI 链接）。
+  两篇 DOI 不同的论文即使标题相同也分别保存（AAAI 的不同 track 中有这种情况）。
+- 索引：年份、(会议, 年份, 规范化标题)、作者姓名、作者 -> 论文，按年份/会议/作者查询都是索引查找。
+- 增量导入：重复导入只会跳过已有论文；load_csv 记录每个文件的大小和修改时间，文件没变时直接跳过。
+- 词频：新论文入库时同一事务内更新 (会议, 年份) 的标题 n-gram 计数（见 ngram_index），词云直接取计数。
+
+用法：
+    corpus = PaperCorpus()
+    corpus.load_csv('ijcai_papers_2020_2025.csv')
+    corpus.year_counts('ijcai')            # 年份 -> 论文数
+    corpus.author_papers('Yoshua Bengio')  # 某作者的论文
+"""
+import csv
+import os
+import re
+import sqlite3
+import unicodedata
+
+import pandas as pd
+
+from ngram_index import NgramIndex
+
+DEFAULT_DB = 'papers.sqlite'
+DOI_PATTERN = re.compile(r'doi\.org/(10\.\S+)$', re.IGNORECASE)
+
+
+def normalize_title(title):
+    """去掉重音和标点、转小写、合并空白，用于判断标题是否相同"""
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode().lower()
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', title).split())
+
+
+def doi_of(link):
+    """从 https://doi.org/10.xxx 形式的链接中取出 DOI（小写），不是 DOI 链接时返回 None"""
+    match = DOI_PATTERN.search(link or '')
+    return match.group(1).lower() if match else None
+
+
+def venue_of(conference):
+    """'IJCAI 2024' -> 'ijcai'"""
+    return conference.rsplit(' ', 1)[0].lower()
+
+
+class PaperCorpus:
+    def __init__(self, path=DEFAULT_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS papers (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                norm_title TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                venue TEXT NOT NULL,
+                conference TEXT NOT NULL,
+                link TEXT,
+                doi TEXT
+            );
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS paper_author (
+                paper_id INTEGER NOT NULL REFERENCES papers(id),
+                author_id INTEGER NOT NULL REFERENCES authors(id),
+                position INTEGER NOT NULL,
+                PRIMARY KEY (paper_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS papers_doi ON papers(doi) WHERE doi IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS papers_link ON papers(link);
+            CREATE INDEX IF NOT EXISTS papers_venue_year ON papers(venue, year, norm_title);
+            CREATE INDEX IF NOT EXISTS papers_year ON papers(year);
+            CREATE INDEX IF NOT EXISTS paper_author_author ON paper_author(author_id);
+        ''')
+        self.ngrams = NgramIndex(self.conn)
+        # 建索引之前已有的论文库：按现有论文补算一次
+        if self.ngrams.is_empty() and self.conn.execute('SELECT 1 FROM papers LIMIT 1').fetchone():
+            try:
+                with self.conn:
+                    self.ngrams.add_titles(self.titles())
+            except BaseException:
+                self.ngrams.reset()
+                raise
+
+    def _find(self, paper, norm_title, venue, doi):
+        """已有的同一篇论文的 id，没有时返回 None"""
+        if doi:
+            row = self.conn.execute('SELECT id FROM papers WHERE doi = ?', (doi,)).fetchone()
+            if row:
+                return row[0]
+        if paper['link']:
+            row = self.conn.execute('SELECT id FROM papers WHERE link = ?', (paper['link'],)).fetchone()
+            if row:
+                return row[0]
+        for paper_id, existing_doi in self.conn.execute(
+                'SELECT id, doi FROM papers WHERE venue = ? AND year = ? AND norm_title = ?',
+                (venue, int(paper['year']), norm_title)):
+            if existing_doi is None or doi is None:
+                if existing_doi is None and doi is not None:
+                    self.conn.execute('UPDATE papers SET doi = ? WHERE id = ?', (doi, paper_id))
+                return paper_id
+        return None
+
+    def _author_ids(self, names, cache):
+        ids = []
+        for name in names:
+            if name not in cache:
+                self.conn.execute('INSERT OR IGNORE INTO authors (name) VALUES (?)', (name,))
+                cache[name] = self.conn.execute('SELECT id FROM authors WHERE name = ?', (name,)).fetchone()[0]
+            ids.append(cache[name])
+        return ids
+
+    def add_papers(self, papers):
+        """导入论文记录（字段同 save_papers_to_csv；authors 为列表或 "; " 连接的字符串），返回新增篇数
+
+        整批在一个事务中写入（连同新论文的 n-gram 计数）；已有的论文跳过，不修改传入的记录。
+        """
+        added = []
+        author_cache = {}
+        try:
+            with self.conn:
+                for paper in papers:
+                    authors = paper['authors']
+                    if isinstance(authors, str):
+                        authors = [name for name in authors.split('; ') if name]
+                    venue = venue_of(paper['conference'])
+                    norm_title = normalize_title(paper['title'])
+                    doi = doi_of(paper['link'])
+                    if self._find(paper, norm_title, venue, doi) is not None:
+                        continue
+                    paper_id = self.conn.execute(
+                        'INSERT INTO papers (title, norm_title, year, venue, conference, link, doi) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (paper['title'], norm_title, int(paper['year']), venue, paper['conference'],
+                         paper['link'] or None, doi)).lastrowid
+                    self.conn.executemany('INSERT INTO paper_author VALUES (?, ?, ?)',
+                                          [(paper_id, author_id, position) for position, author_id
+                                           in enumerate(self._author_ids(authors, author_cache))])
+                    added.append((venue, int(paper['year']), paper['title']))
+                self.ngrams.add_titles(added)
+        except BaseException:
+            # 事务已回滚，n-gram 词表缓存中的新编号随之作废
+            self.ngrams.reset()
+            raise
+        return len(added)
+
+    def load_csv(self, path):
+        """增量导入 save_papers_to_csv 格式的CSV；文件大小和修改时间都没变时跳过，返回新增篇数"""
+        stat = os.stat(path)
+        source = os.path.abspath(path)
+        row = self.conn.execute('SELECT size, mtime FROM sources WHERE path = ?', (source,)).fetchone()
+        if row == (stat.st_size, stat.st_mtime):
+            return 0
+        with open(path, encoding='utf-8', newline='') as f:
+            added = self.add_papers(csv.DictReader(f))
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?)', (source, stat.st_size, stat.st_mtime))
+        print(f"已从 {path} 导入 {added} 篇新论文")
+        return added
+
+    @staticmethod
+    def _where(venues, start_year, end_year):
+        clauses, params = [], []
+        if venues:
+            clauses.append(f"p.venue IN ({', '.join('?' * len(venues))})")
+            params += list(venues)
+        if start_year is not None:
+            clauses.append('p.year >= ?')
+            params.append(start_year)
+        if end_year is not None:
+            clauses.append('p.year <= ?')
+            params.append(end_year)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def year_counts(self, venue=None):
+        """各年份论文数（Series，按年份排序）"""
+        where, params = self._where([venue] if venue else None, None, None)
+        rows = self.conn.execute(f'SELECT p.year, COUNT(*) FROM papers p{where} GROUP BY p.year ORDER BY p.year',
+                                 params).fetchall()
+        return pd.Series(dict(rows), name='count', dtype='int64').rename_axis('year')
+
+    def titles(self, venues=None, start_year=None, end_year=None):
+        """筛选范围内论文的 (会议, 年份, 标题)"""
+        where, params = self._where(venues, start_year, end_year)
+        return self.conn.execute(f'SELECT p.venue, p.year, p.title FROM papers p{where} ORDER BY p.id',
+                                 params).fetchall()
+
+    def papers_frame(self, venues=None, start_year=None, end_year=None):
+        """与CSV相同列的 DataFrame（title, authors, year, conference, link），authors 按署名顺序用 "; " 连接"""
+        where, params = self._where(venues, start_year, end_year)
+        return pd.read_sql_query(f'''
+            SELECT p.title, COALESCE(a.names, '') AS authors, p.year, p.conference, COALESCE(p.link, '') AS link
+            FROM papers p
+            LEFT JOIN (
+                SELECT paper_id, group_concat(name, '; ') AS names
+                FROM (SELECT pa.paper_id, au.name FROM paper_author pa JOIN authors au ON au.id = pa.author_id
+                      ORDER BY pa.paper_id, pa.position)
+                GROUP BY paper_id
+            ) a ON a.paper_id = p.id{where}
+            ORDER BY p.id''', self.conn, params=params)
+
+    def author_papers(self, name):
+        """某作者的全部论文（按年份），经 authors.name 和 paper_author(author_id) 两次索引查找"""
+        return pd.read_sql_query('''
+            SELECT p.title, p.year, p.conference, p.link, pa.position + 1 AS 署名位次
+            FROM authors au
+            JOIN paper_author pa ON pa.author_id = au.id
+            JOIN papers p ON p.id = pa.paper_id
+            WHERE au.name = ?
+            ORDER BY p.year, p.id''', self.conn, params=(name,))
+
+    def top_authors(self, venues=None, start_year=None, end_year=None, limit=20):
+        """发表论文最多的作者"""
+        where, params = self._where(venues, start_year, end_year)
+        return pd.read_sql_query(f'''
+            SELECT au.name, COUNT(*) AS papers
+            FROM papers p JOIN paper_author pa ON pa.paper_id = p.id JOIN authors au ON au.id = pa.author_id{where}
+            GROUP BY au.id ORDER BY papers DESC, au.name LIMIT ?''', self.conn, params=params + [limit])
+
+    def export_csv(self, filename, venues=None, start_year=None, end_year=None):
+        """导出为 save_papers_to_csv 格式的CSV"""
+        df = self.papers_frame(venues, start_year, end_year)
+        df.to_csv(filename, index=False, encoding='utf-8')
+        print(f"✅ 已保存为 {filename}（{len(df)} 篇）")
+
+    def close(self):
+        self.conn.close()
@@ -5,17 +5,13 @@
 
 
 # === 网络请求与网页解析 ===
-import requests
-from bs4 import BeautifulSoup
-import re
-import csv
+from dblp_dump import dump_to_csv
+from dblp_parser import crawl_to_csv, iter_papers, write_papers
+from paper_corpus import PaperCorpus
 
 # === 数据处理与分析 ===
 import pandas as pd
 import numpy as np
-from collections import Counter
-from itertools import tee, islice
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from sklearn.linear_model import LinearRegression
 
 # === 可视化 ===
@@ -25,152 +21,93 @@ from matplotlib import rcParams
 from wordcloud import WordCloud
 
 # === 其他工具 ===
-import string
+import os
 
 
 # In[2]:
 
 
-def fix_conference_spacing(name):
-    # 修正会议名称中的空格问题
-    name = re.sub(r'(\d+(?:st|nd|rd|th))([A-Z])', r'\1 \2', name)
-    name = re.sub(r'([A-Za-z])(\d{4})', r'\1 \2', name)
-    return name
-
-def get_html(url):
-    print(f"正在抓取页面: {url}")
-    r = requests.get(url)
-    if r.status_code != 200:
-        print(f"抓取失败，状态码：{r.status_code}，跳过该页")
-        return None
-    return r.text
-
-
-# In[3]:
-
-
 def parse_papers_from_year_page(html, year, conf_name):
-    soup = BeautifulSoup(html, 'html.parser')
-    results = []
-
-    entries = soup.find_all('li', class_='entry inproceedings')
-
-    for entry in entries:
-        title_tag = entry.find('span', class_='title')
-        title = title_tag.text.strip() if title_tag else ""
-
-        authors = []
-        for author_tag in entry.find_all('span', itemprop='author'):
-            name_tag = author_tag.find('span', itemprop='name')
-            if name_tag:
-                authors.append(name_tag.text.strip())
-
-        conference_name = f"{conf_name.upper()} {year}"
-        conference_name = fix_conference_spacing(conference_name)
-
-        link_tag = entry.find('a', href=True)
-        link = link_tag['href'] if link_tag else ""
-
-        results.append({
-            'title': title,
-            'authors': authors,
-            'year': str(year),
-            'conference': conference_name,
-            'link': link
-        })
+    # 流式解析（见 dblp_parser.iter_papers），逐篇产出；这里为了兼容整页解析的用法收集成列表
+    return list(iter_papers(html, year, conf_name))
 
-    return results
 
-
-# In[4]:
+# In[3]:
 
 
-def crawl_conference_years(conf_name, start_year=2020, end_year=2025):
-    all_papers = []
-    for year in range(end_year, start_year - 1, -1):
-        url = f"https://dblp.uni-trier.de/db/conf/{conf_name}/{conf_name}{year}.html"
-        html = get_html(url)
-        if html:
-            papers = parse_papers_from_year_page(html, year, conf_name)
-            all_papers.extend(papers)
-    return all_papers
+# 已下载 DBLP 数据集（dblp.xml.gz 和 dblp.dtd，见 https://dblp.org/xml/）时直接从本地导出，不需要抓取；
+# 否则三个会议 × 六个年份的页面并发抓取（共用长连接、gzip压缩、失败重试、按主机限速），
+# 边下载边解析。两种方式都是论文逐条直接写入各会议的CSV，不在内存中收集整页或全部论文
+if os.path.exists('dblp.xml.gz'):
+    paper_counts = dump_to_csv('dblp.xml.gz', ['ijcai', 'cvpr', 'aaai'], 2020, 2025)
+else:
+    paper_counts = crawl_to_csv(['ijcai', 'cvpr', 'aaai'], 2020, 2025, max_workers=6, rate=1.0)
 
 
 # In[5]:
 
 
-# 测试抓取多年份数据
-papers_ijcai = crawl_conference_years('ijcai', 2020, 2025)
-papers_cvpr = crawl_conference_years('cvpr', 2020, 2025)
-papers_aaai = crawl_conference_years('aaai', 2020, 2025)
+# 显示各会议前3条
+pd.read_csv("ijcai_papers_2020_2025.csv", nrows=3)
 
 
 # In[ ]:
 
 
-papers_ijcai[:3]  # 显示前3条
+pd.read_csv("cvpr_papers_2020_2025.csv", nrows=3)
 
 
 # In[ ]:
 
 
-papers_cvpr[:3]  # 显示前3条
-
-
-# In[ ]:
-
-
-papers_aaai[:3]  # 显示前3条
+pd.read_csv("aaai_papers_2020_2025.csv", nrows=3)
 
 
 # In[6]:
 
 
 def save_papers_to_csv(papers, filename="papers.csv"):
-    # 定义 CSV 文件的字段名（列名）
-    fieldnames = ['title', 'authors', 'year', 'conference', 'link']
-
+    # 列为 title, authors, year, conference, link；authors 列表在写入时转成用分号分隔的字符串，
+    # 不修改传入的论文记录（见 dblp_parser.write_papers）
     with open(filename, mode='w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        count = write_papers(papers, f)
 
-        # 写入表头
-        writer.writeheader()
+    print(f"成功保存 {count} 篇论文到文件：{filename}")
 
-        for paper in papers:
-            # authors 列是列表，转成用分号分隔的字符串
-            paper['authors'] = '; '.join(paper['authors'])
-            writer.writerow(paper)
 
-    print(f"成功保存 {len(papers)} 篇论文到文件：{filename}")
+# In[7]:
 
 
-# In[7]:
+# 把三个会议的CSV增量导入本地论文库（papers.sqlite：论文、作者、论文-作者三张表，按DOI/链接和规范化标题去重），
+# 已导入且没有变化的文件直接跳过；后面按会议、年份、作者的统计都直接查询论文库，不再反复读取和拼接CSV
+csv_files = [
+    "aaai_papers_2020_2025.csv",
+    "cvpr_papers_2020_2025.csv",
+    "ijcai_papers_2020_2025.csv"
+]
+corpus = PaperCorpus()
+for f in csv_files:
+    corpus.load_csv(f)
+
+
+# In[ ]:
 
 
-save_papers_to_csv(papers_ijcai, "ijcai_papers_2020_2025.csv")
-save_papers_to_csv(papers_cvpr, "cvpr_papers_2020_2025.csv")
-save_papers_to_csv(papers_aaai, "aaai_papers_2020_2025.csv")
+corpus.top_authors(limit=10)  # 论文最多的作者
 
 
 # In[23]:
 
 
-def plot_year_trend_from_csv(csv_file, chart_title="会议论文数量年度变化趋势"):
+def plot_year_trend(venue, chart_title="会议论文数量年度变化趋势"):
     """
-    从 CSV 文件读取论文数据，并绘制按年份统计的论文数量趋势图。
+    从论文库查询某会议各年份的论文数量，并绘制趋势图。
 
-    :param csv_file: str，CSV 文件路径
+    :param venue: str，会议名（如 'ijcai'）
     :param chart_title: str，图表标题（可自定义）
     """
-    df = pd.read_csv(csv_file)
-
-    # 处理年份字段
-    df['year'] = pd.to_numeric(df['year'], errors='coerce')
-    df = df.dropna(subset=['year'])
-    df['year'] = df['year'].astype(int)
-
-    # 按年份统计数量
-    year_counts = df['year'].value_counts().sort_index()
+    # 按年份统计数量（论文库中按会议、年份建有索引）
+    year_counts = corpus.year_counts(venue)
     plot_df = pd.DataFrame({
         'year': year_counts.index,
         'count': year_counts.values
@@ -196,41 +133,18 @@ def plot_year_trend_from_csv(csv_file, chart_title="会议论文数量年度变
 # In[24]:
 
 
-plot_year_trend_from_csv("ijcai_papers_2020_2025.csv",chart_title="IJCAI 2020-2025 年论文数量变化趋势")
-plot_year_trend_from_csv("cvpr_papers_2020_2025.csv",chart_title="CVPR 2020-2025 年论文数量变化趋势")
-plot_year_trend_from_csv("aaai_papers_2020_2025.csv",chart_title="AAAI 2020-2025 年论文数量变化趋势")
+plot_year_trend("ijcai", chart_title="IJCAI 2020-2025 年论文数量变化趋势")
+plot_year_trend("cvpr", chart_title="CVPR 2020-2025 年论文数量变化趋势")
+plot_year_trend("aaai", chart_title="AAAI 2020-2025 年论文数量变化趋势")
 
 
 # In[25]:
 
 
-# 停用词集合（英文+自定义）
-stop_words = set(ENGLISH_STOP_WORDS)
-custom_stopwords = {
-    'february'
-}
-stop_words = stop_words.union(custom_stopwords)
-
-# 生成n元短语（ngram）
-def generate_ngrams(words, n):
-    iters = tee(words, n)
-    for i, it in enumerate(iters):
-        next(islice(it, i, i), None)
-    return zip(*iters)
-
-def generate_bigram_wordcloud(papers, start_year, end_year, title, top_k=100):
-    # 过滤出目标年份范围内论文标题
-    titles = [paper['title'] for paper in papers
-              if paper.get('year') and str(paper['year']).isdigit()
-              and start_year <= int(paper['year']) <= end_year]
-
-    all_text = ' '.join(titles).lower()
-    all_text = all_text.translate(str.maketrans('', '', string.punctuation))
-
-    words = [w for w in all_text.split() if w not in stop_words and len(w) > 2]
-
-    bigrams = [' '.join(bi) for bi in generate_ngrams(words, 2)]
-    bigram_counts = Counter(bigrams)
+# 标题的分词、停用词（英文+自定义）和 n-gram 计数在论文入库时已完成（见 ngram_index.py），
+# 这里按年份范围和会议把预先算好的计数相加即可，不再逐篇切分标题
+def generate_bigram_wordcloud(start_year, end_year, title, venues=None, top_k=100):
+    bigram_counts = corpus.ngrams.counts(2, venues=venues, start_year=start_year, end_year=end_year)
 
     # 去除无效短语
     exclude_phrases = {"student abstract", "call for", "revised selected"}
@@ -258,58 +172,38 @@ def generate_bigram_wordcloud(papers, start_year, end_year, title, top_k=100):
 # In[26]:
 
 
-# 定义要合并的CSV文件路径
-csv_files = [
-    "aaai_papers_2020_2025.csv",
-    "cvpr_papers_2020_2025.csv",
-    "ijcai_papers_2020_2025.csv"
-]
-
-# 读取并合并所有 CSV 文件
-dfs = [pd.read_csv(f) for f in csv_files]
-combined_df = pd.concat(dfs, ignore_index=True)
-# 保存到新文件
-combined_df.to_csv("all_conference_papers_2020_2025.csv", index=False, encoding='utf-8')
-print("✅ 已保存为 all_conference_papers_2020_2025.csv")
+# 需要合并后的CSV文件时从论文库导出（去重后的全部论文，顺序与按 csv_files 依次拼接相同）
+corpus.export_csv("all_conference_papers_2020_2025.csv")
 
 
 # In[27]:
 
 
-def generate_wordcloud_from_csv(csv_path, start_year=2020, end_year=2025):
+def generate_wordcloud(start_year=2020, end_year=2025, venues=None):
     # 确保 generate_bigram_wordcloud 函数已经定义
 
-    df = pd.read_csv(csv_path)
-    papers = df.to_dict(orient='records')
-
     # 生成词云
     generate_bigram_wordcloud(
-        papers, 
         start_year=start_year, 
         end_year=end_year, 
-        title=f'{start_year}-{end_year} 高频双词词云'
+        title=f'{start_year}-{end_year} 高频双词词云',
+        venues=venues
     )
 
 
 # In[28]:
 
 
-generate_wordcloud_from_csv('all_conference_papers_2020_2025.csv', start_year=2020, end_year=2022)
-generate_wordcloud_from_csv('all_conference_papers_2020_2025.csv', start_year=2023, end_year=2025)
+generate_wordcloud(start_year=2020, end_year=2022)
+generate_wordcloud(start_year=2023, end_year=2025)
 
 
 # In[29]:
 
 
-def predict_and_plot_by_year(csv_path, title="会议论文数量趋势（按年份）"):
-    df = pd.read_csv(csv_path)
-
-    # 仅保留有效年份
-    df = df[df['year'].apply(lambda x: str(x).isdigit())]
-    df['year'] = df['year'].astype(int)
-
-    # 统计每年论文数量
-    year_counts = df['year'].value_counts().sort_index()
+def predict_and_plot_by_year(venue, title="会议论文数量趋势（按年份）"):
+    # 从论文库查询每年论文数量
+    year_counts = corpus.year_counts(venue)
     years = list(year_counts.index)
     counts = list(year_counts.values)
 
@@ -346,19 +240,19 @@ def predict_and_plot_by_year(csv_path, title="会议论文数量趋势（按年
 # In[33]:
 
 
-predict_and_plot_by_year("ijcai_papers_2020_2025.csv", title="IJCAI 2020-2025 论文数量趋势预测")
+predict_and_plot_by_year("ijcai", title="IJCAI 2020-2025 论文数量趋势预测")
 
 
 # In[34]:
 
 
-predict_and_plot_by_year("cvpr_papers_2020_2025.csv", title="CVPR 2020-2025 论文数量趋势预测")
+predict_and_plot_by_year("cvpr", title="CVPR 2020-2025 论文数量趋势预测")
 
 
 # In[36]:
 
 
-predict_and_plot_by_year("aaai_papers_2020_2025.csv", title="AAAI 2020-2025 论文数量趋势预测")
+predict_and_plot_by_year("aaai", title="AAAI 2020-2025 论文数量趋势预测")
 
 
 # In[ ]:
@@ -0,0 +1,73 @@
+"""预测引擎基准：数百条序列的训练、缓存命中和滚动起点回测耗时
+
+用法：python bench_forecast.py [--cities 城市数] [--jobs 进程数]
+
+以 weather_store 中大连的逐月汇总为基础，给每个合成城市加上随机的温度偏移和噪声，
+得到 城市数 × 3 个目标 条序列。依次计时：冷启动训练（并行）、同样数据再次预测（全部命中缓存）、
+滚动起点回测，并与不缓存、单进程、逐条序列训练的耗时对比，同时校验分批训练与逐条训练的预测一致。
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecast import ForecastEngine, backtest_summary, build_series, per_output_intercept
+from weather_store import load_rollup
+
+
+def synthetic_series(cities, seed=0):
+    base = build_series(load_rollup().monthly(['dalian'], '202201', '202506'))
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(cities):
+        frame = base.assign(city=f'city{i:03d}')
+        offset = np.where(frame['目标'] == '风力等级', 0.0, rng.normal(0, 5))
+        frame['值'] = frame['值'] + offset + rng.normal(0, 0.5, len(frame))
+        frames.append(frame)
+    series = pd.concat(frames, ignore_index=True)
+    series['city'] = series['city'].astype('category')
+    return series
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=100, help='合成城市数')
+    parser.add_argument('--jobs', type=int, default=None, help='训练进程数（默认CPU核数）')
+    args = parser.parse_args()
+
+    series = synthetic_series(args.cities)
+    print(f"{series.groupby(['city', '目标'], observed=True).ngroups} 条序列，{len(series)} 行")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine = ForecastEngine(cache_dir=cache_dir, n_jobs=args.jobs)
+        cold = timed("冷启动训练并预测", lambda: engine.forecast(series, '202412', horizon=6))
+        warm = timed("再次预测（命中缓存）", lambda: engine.forecast(series, '202412', horizon=6))
+        if not np.allclose(cold['预测'], warm['预测']):
+            raise SystemExit("缓存模型的预测与新训练的模型不一致")
+        print(f"模型：训练 {engine.stats['trained']}，缓存命中 {engine.stats['cached']}")
+
+        origins = ['202312', '202403', '202406', '202409', '202412']
+        errors = timed(f"滚动起点回测（{len(origins)} 个起点）",
+                       lambda: engine.backtest(series, origins, horizon=6))
+        print(backtest_summary(errors).groupby('目标', observed=True)[['MAE', 'RMSE']].mean().round(2))
+
+    # 对照：关闭缓存、单进程、每条序列一个模型，相当于每条序列各跑一次（5）预测模型.py 的训练部分
+    serial = ForecastEngine(cache_dir=None, n_jobs=1, batch_size=1)
+    expected = timed("对照：单进程逐条训练", lambda: serial.forecast(series, '202412', horizon=6))
+    if not np.allclose(cold['预测'], expected['预测'], equal_nan=True):
+        raise SystemExit("分批训练的预测与逐条训练不一致")
+    print(f"分批训练与逐条训练的预测一致（每批最多 {engine.batch_size} 条，"
+          f"{'各输出单独估计截距' if per_output_intercept() else '当前 xgboost 只有共用截距，已退回逐条训练'}）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""月度页面解析基准：各解析后端的单页耗时，并校验输出与原始 bs4 实现一致
+
+用法：
+    python bench_weather_parser.py --corpus saved_pages/    # 目录下的 {城市}/{YYYYMM}.html
+    python bench_weather_parser.py --pages 120              # 没有保存的页面时用合成页面
+
+合成页面会附加 --padding-kb 大小的导航/脚本样板，接近真实页面的体积
+（真实页面中表格只占一小部分，整页建树的代价主要花在其余部分）。
+"""
+import argparse
+import time
+from pathlib import Path
+
+from weather_parser import BACKENDS, lxml, parse_weather_table
+from weather_stand_in import synthetic_month_page
+
+
+def load_corpus(directory):
+    """读取保存的页面，返回 [(year_month, html), ...]"""
+    return [(path.stem, path.read_text(encoding='utf-8'))
+            for path in sorted(Path(directory).glob('**/*.html')) if path.stem.isdigit()]
+
+
+def synthetic_corpus(pages, padding_kb):
+    boilerplate = ''.join(
+        f'<div class="nav"><ul>{"".join(f"<li><a href=/lishi/c{i}{j}.html>城市{j}</a></li>" for j in range(20))}</ul>'
+        f'<script>var x{i} = {i};</script></div>' for i in range(padding_kb))
+    corpus = []
+    for i in range(pages):
+        year, month = 2000 + i // 12, i % 12 + 1
+        html = synthetic_month_page('dalian', year, month)
+        corpus.append((f"{year}{month:02d}", html.replace('<body>', '<body>' + boilerplate)))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='保存的页面目录')
+    parser.add_argument('--pages', type=int, default=120, help='合成页面数')
+    parser.add_argument('--padding-kb', type=int, default=60, help='合成页面附加的样板大小（约KB）')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数，取最快一次')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages, args.padding_kb)
+    size_kb = sum(len(html.encode('utf-8')) for _, html in corpus) / len(corpus) / 1024
+    print(f"{len(corpus)} 个页面，平均 {size_kb:.0f}KB")
+
+    expected = [parse_weather_table(html, ym, backend='bs4') for ym, html in corpus]
+    timings = {}
+    for backend in BACKENDS:
+        if backend == 'lxml' and lxml is None:
+            print(f"{backend:>9}: 未安装 lxml，跳过")
+            continue
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = [parse_weather_table(html, ym, backend=backend) for ym, html in corpus]
+            best = min(best, time.perf_counter() - start)
+        if result != expected:
+            raise SystemExit(f"{backend} 的解析结果与 bs4 不一致")
+        timings[backend] = best / len(corpus) * 1000
+
+    for backend, per_page in timings.items():
+        print(f"{backend:>9}: {per_page:7.2f} ms/页  （bs4 的 {timings['bs4'] / per_page:.1f} 倍速）")
+    print(f"结果一致：共 {sum(map(len, expected))} 条记录")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""风力分级基准：原来的逐行 classify_wind（Series.apply）对比向量化的 wind.classify_wind_levels
+
+用法：python bench_wind.py [--rows 行数]
+
+数据取自 weather_store 中的真实风力字符串，重复到指定行数（模拟多城市、多年的数据量），
+另外混入缺失值和几种边界写法，并校验两种实现的分级结果完全一致。
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from weather_store import load_weather
+from wind import classify_wind_levels
+
+EDGE_CASES = [None, '无持续风向 5-6级', '东北风转无持续风向 3-4级', '南风 <3级', '微风', '北风 3级转4-5级', '西北风 7-8级',
+              '东风 12级']
+
+
+def classify_wind(wind_str):
+    """（3）风力统计.py 原来的逐行实现，作为对照"""
+    if pd.isna(wind_str):
+        return '1-2级'
+    if '无持续风向' in wind_str:
+        return '1-2级'
+    match = re.search(r'(\d+)-(\d+)级', wind_str)
+    if not match:
+        match = re.search(r'(\d+)级', wind_str)
+        if match:
+            wind_num = int(match.group(1))
+        else:
+            return '1-2级'
+    else:
+        wind_num = int(match.group(2))
+    if wind_num <= 2:
+        return '1-2级'
+    elif wind_num <= 4:
+        return '3-4级'
+    elif wind_num == 5:
+        return '4-5级'
+    elif wind_num == 6:
+        return '5-6级'
+    elif wind_num == 7:
+        return '6-7级'
+    else:
+        return '>7级'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='测试行数')
+    args = parser.parse_args()
+
+    source = load_weather(columns=['白天风力', '夜晚风力'])
+    values = np.concatenate([source['白天风力'].to_numpy(object), source['夜晚风力'].to_numpy(object),
+                             np.array(EDGE_CASES, dtype=object)])
+    series = pd.Series(np.resize(values, args.rows), dtype='string')
+    print(f"{len(series)} 行，{series.nunique()} 种不同写法")
+
+    start = time.perf_counter()
+    expected = series.apply(classify_wind)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = classify_wind_levels(series)
+    vector_seconds = time.perf_counter() - start
+
+    if not (result.astype(object) == expected.astype(object)).all():
+        raise SystemExit("向量化结果与逐行实现不一致")
+    print(f"Series.apply(classify_wind): {apply_seconds:.2f}s")
+    print(f"classify_wind_levels:        {vector_seconds:.2f}s（{apply_seconds / vector_seconds:.1f} 倍速）")
+    print("结果一致")
+
+
+if __name__ == '__main__':
+    main()
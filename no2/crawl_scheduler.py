@@ -0,0 +1,220 @@
+"""多城市、多年份天气批量爬取调度器
+
+把 (城市, 月份) 展开为任务，跳过检查点中已完成的任务，剩余任务用共享连接池的会话并发抓取，
+下载线程只取原始页面，解析交给进程池（见 fetch_pipeline），每完成一个任务就把解析结果和
+任务状态在同一个事务里写入SQLite检查点。
+爬取中断（Ctrl+C、断网、进程被杀）后重新运行同样的命令，只会抓取尚未完成的页面。
+
+用法：
+    python crawl_scheduler.py --cities dalian shenyang --start 202201 --end 202506
+    python crawl_scheduler.py --cities dalian --start 202201 --end 202212 --base-url http://127.0.0.1:8766
+"""
+import argparse
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import date
+
+import pandas as pd
+
+from fetch_pipeline import fetch_parse_pipeline
+from polite_http import make_polite_client, polite_get
+from response_cache import ResponseCache
+from weather_parser import has_weather_table, is_closed, parse_page
+
+BASE_URL = "https://www.tianqihoubao.com"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
+}
+DEFAULT_DB = 'weather_crawl.sqlite'
+
+CrawlTask = namedtuple('CrawlTask', ['city', 'year_month'])
+
+
+def month_path(city, year_month):
+    """城市某月的页面路径，year_month 形如 '202201'"""
+    return f"/lishi/{city}/month/{year_month}.html"
+
+
+def iter_months(start, end):
+    """start 到 end（含）之间的全部月份，格式均为 'YYYYMM'"""
+    year, month = int(start[:4]), int(start[4:])
+    while f"{year}{month:02d}" <= end:
+        yield f"{year}{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def expand_tasks(cities, start, end):
+    """展开为 城市 × 月份 的任务列表"""
+    return [CrawlTask(city, year_month) for city in cities for year_month in iter_months(start, end)]
+
+
+class CrawlCheckpoint:
+    """SQLite检查点：任务状态表 + 按 (城市, 日期) 去重的逐日天气表
+
+    任务状态：done 已完成（已结束的月份，不再抓取）；open 当月（数据未完整，下次运行重新抓取）；
+    failed 重试用尽仍失败（下次运行重新抓取）。
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                city TEXT NOT NULL,
+                year_month TEXT NOT NULL,
+                status TEXT NOT NULL,
+                rows INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (city, year_month)
+            );
+            CREATE TABLE IF NOT EXISTS weather (
+                city TEXT NOT NULL,
+                日期 TEXT NOT NULL,
+                白天天气 TEXT,
+                夜晚天气 TEXT,
+                最高温度 INTEGER,
+                最低温度 INTEGER,
+                白天风力 TEXT,
+                夜晚风力 TEXT,
+                PRIMARY KEY (city, 日期)
+            );
+        ''')
+
+    def pending(self, tasks):
+        """过滤掉已完成的任务（一次性读出已完成集合，任务数很多时也只查询一次）"""
+        done = set(self.conn.execute("SELECT city, year_month FROM tasks WHERE status = 'done'"))
+        return [task for task in tasks if (task.city, task.year_month) not in done]
+
+    def save(self, task, records, closed=True):
+        """写入一个任务的全部记录并标记状态（同一事务，中断时不会出现"数据写了一半"）"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO weather VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(task.city, r['日期'], r['白天天气'], r['夜晚天气'], int(r['最高温度']), int(r['最低温度']),
+                  r['白天风力'], r['夜晚风力']) for r in records])
+            self._mark(task, 'done' if closed else 'open', len(records), None)
+
+    def fail(self, task, error):
+        with self.conn:
+            self._mark(task, 'failed', 0, str(error))
+
+    def _mark(self, task, status, rows, error):
+        self.conn.execute('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)',
+                          (task.city, task.year_month, status, rows, error, time.time()))
+
+    def summary(self):
+        """{状态: 任务数}"""
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status'))
+
+    def load_frame(self, cities=None):
+        """读出逐日天气数据（列与 save_to_excel 输出一致，另加 city 列）"""
+        query = 'SELECT * FROM weather'
+        params = []
+        if cities:
+            query += f" WHERE city IN ({', '.join('?' * len(cities))})"
+            params = list(cities)
+        df = pd.read_sql_query(query + ' ORDER BY city, 日期', self.conn, params=params)
+        df['日期'] = pd.to_datetime(df['日期'])
+        return df
+
+    def close(self):
+        self.conn.close()
+
+
+class CrawlScheduler:
+    """用共享会话并发下载、进程池解析，结果在主线程逐个写入检查点"""
+
+    def __init__(self, checkpoint, base_url=BASE_URL, max_workers=8, rate=2.0, retries=3, parse_workers=None,
+                 cache=None):
+        self.checkpoint = checkpoint
+        self.cache = cache  # 可选的 ResponseCache
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.parse_workers = parse_workers
+        # 所有城市都在同一个站点上，限速对整个调度器生效
+        self.session, self.limiter, self.retry, _ = make_polite_client(HEADERS, max_workers, rate, retries=retries,
+                                                                       pool_size=max_workers)
+
+    def fetch(self, task):
+        """下载一个月份页面，返回 parse_page 的参数；状态码不是200或页面里没有表格时抛出异常
+
+        反爬页面也返回200但没有表格，解析结果为空；不拦下的话已结束的月份会以0行记为完成，再也不会重抓。
+        """
+        url = self.base_url + month_path(task.city, task.year_month)
+        if self.cache is not None:
+            response = self.cache.get(self.session, url, is_closed(task.year_month), self.limiter, self.retry,
+                                      validate=has_weather_table)
+        else:
+            response = polite_get(self.session, url, self.limiter, self.retry)
+        if response.status_code != 200:
+            raise RuntimeError(f"请求失败，状态码: {response.status_code}")
+        if not has_weather_table(response.content):
+            raise RuntimeError("页面中没有天气表格（可能是反爬页面）")
+        return response.content, task.year_month
+
+    def run(self, tasks, progress_every=100):
+        """执行尚未完成的任务，返回本次的 {状态: 任务数}
+
+        待下载和待解析的页面数都有上限，任务总数再多，内存占用也不会随之增长。
+        """
+        todo = self.checkpoint.pending(tasks)
+        print(f"共 {len(tasks)} 个任务，已完成 {len(tasks) - len(todo)} 个，本次需要抓取 {len(todo)} 个")
+        stats = {'done': 0, 'open': 0, 'failed': 0}
+        start = time.monotonic()
+
+        results = fetch_parse_pipeline(self.fetch, todo, parse_page, io_workers=self.max_workers,
+                                       parse_workers=self.parse_workers, max_pending=self.max_workers * 4)
+        try:
+            for task, records, error in results:
+                if error is not None:
+                    print(f"{task.city} {task.year_month} 失败: {error}")
+                    self.checkpoint.fail(task, error)
+                    stats['failed'] += 1
+                else:
+                    closed = is_closed(task.year_month)
+                    self.checkpoint.save(task, records, closed)
+                    stats['done' if closed else 'open'] += 1
+
+                finished_count = sum(stats.values())
+                if finished_count % progress_every == 0:
+                    rate = finished_count / (time.monotonic() - start)
+                    print(f"进度 {finished_count}/{len(todo)}，{rate:.1f} 页/秒")
+        except KeyboardInterrupt:
+            # 已完成的任务都已提交到检查点，丢弃排队中的页面后退出
+            print("已中断，重新运行同样的命令即可从检查点继续")
+            raise
+        finally:
+            results.close()
+
+        print(f"本次完成: {stats}，检查点累计: {self.checkpoint.summary()}")
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多城市、多年份天气批量爬取')
+    parser.add_argument('--cities', nargs='+', default=['dalian'], help='城市拼音，如 dalian shenyang')
+    parser.add_argument('--start', default='202201', help='起始月份 YYYYMM')
+    parser.add_argument('--end', default=date.today().strftime('%Y%m'), help='结束月份 YYYYMM（含）')
+    parser.add_argument('--db', default=DEFAULT_DB, help='检查点数据库')
+    parser.add_argument('--base-url', default=BASE_URL, help='站点地址（测试时指向本地替身站点）')
+    parser.add_argument('--workers', type=int, default=8, help='并发线程数')
+    parser.add_argument('--rate', type=float, default=2.0, help='每秒最多请求数')
+    parser.add_argument('--parse-workers', type=int, default=None, help='解析进程数（默认CPU核数）')
+    parser.add_argument('--cache', default=None, help='HTTP响应缓存文件（默认不缓存页面）')
+    args = parser.parse_args(argv)
+
+    checkpoint = CrawlCheckpoint(args.db)
+    cache = ResponseCache(args.cache) if args.cache else None
+    try:
+        scheduler = CrawlScheduler(checkpoint, args.base_url, args.workers, args.rate,
+                                   parse_workers=args.parse_workers, cache=cache)
+        scheduler.run(expand_tasks(args.cities, args.start, args.end))
+    finally:
+        checkpoint.close()
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == '__main__':
+    main()
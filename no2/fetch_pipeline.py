@@ -0,0 +1,96 @@
+"""两级抓取流水线：I/O线程只负责下载，进程池负责解析
+
+下载线程把原始页面字节放入有界队列（队列满时下载线程阻塞，即反压），主线程从队列取出页面
+交给进程池解析，同时在途的解析任务也有上限。内存中最多只有 max_pending 个原始页面和
+2×parse_workers 个解析任务，解析不再占用下载线程的GIL，多城市大批量爬取可以用满所有CPU核。
+
+解析进程用 forkserver（没有时用 spawn）启动，而不是 Linux 默认的 fork：进程池在第一次 submit 时
+才创建子进程，此时下载线程正在请求和打印，fork 出的子进程可能继承一把被占用的锁（stdout、连接池、
+logging）而死锁。
+"""
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+_DONE = object()
+
+
+def _pool_context():
+    """解析进程池的启动方式：优先 forkserver，Windows 等平台上为 spawn"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def fetch_parse_pipeline(fetch, items, parse, io_workers=8, parse_workers=None, max_pending=32):
+    """按完成顺序产出 (item, 解析结果, 异常)
+
+    fetch(item) 在下载线程中运行，返回 parse 的参数元组，返回None表示跳过该item；
+    parse 在子进程中运行，必须是模块级函数（可被pickle）；子进程会重新导入主模块，调用脚本要有 __main__ 保护。
+    下载或解析抛出的异常不会中断流水线，而是放在第三项中交给调用方处理。
+    """
+    parse_workers = parse_workers or os.cpu_count() or 1
+    pending = queue.Queue(maxsize=max_pending)
+    source = iter(items)
+    source_lock = threading.Lock()
+    stop = threading.Event()
+
+    def put(entry):
+        # 带超时地放入，调用方提前结束时下载线程能及时退出
+        while not stop.is_set():
+            try:
+                pending.put(entry, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def download():
+        while not stop.is_set():
+            with source_lock:
+                item = next(source, _DONE)
+            if item is _DONE:
+                break
+            try:
+                put((item, fetch(item), None))
+            except Exception as e:
+                put((item, None, e))
+        put(_DONE)
+
+    threads = [threading.Thread(target=download, daemon=True) for _ in range(io_workers)]
+    alive = io_workers
+    try:
+        # 先建进程池再启动下载线程
+        with ProcessPoolExecutor(max_workers=parse_workers, mp_context=_pool_context()) as pool:
+            for thread in threads:
+                thread.start()
+            in_flight = {}
+            while alive or in_flight:
+                # 解析任务未满时从队列取页面；没有在途任务时阻塞等待下载
+                while alive and len(in_flight) < 2 * parse_workers:
+                    try:
+                        entry = pending.get(block=not in_flight)
+                    except queue.Empty:
+                        break
+                    if entry is _DONE:
+                        alive -= 1
+                        continue
+                    item, args, error = entry
+                    if error is not None:
+                        yield item, None, error
+                    elif args is not None:
+                        in_flight[pool.submit(parse, *args)] = item
+
+                if in_flight:
+                    finished, _ = wait(in_flight, timeout=0.05 if alive else None, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        item = in_flight.pop(future)
+                        try:
+                            yield item, future.result(), None
+                        except Exception as e:
+                            yield item, None, e
+    finally:
+        stop.set()
+        for thread in threads:
+            if thread.is_alive():
+                thread.join()
@@ -0,0 +1,242 @@
+"""多城市、多目标的月度预测引擎（把（5）预测模型.py 的做法推广到任意多条序列）
+
+    series = build_series(load_rollup().monthly())        # (city, 目标, 年, 月, 值) 长表
+    engine = ForecastEngine()
+    result = engine.forecast(series, train_end='202412', horizon=6)
+    errors = engine.backtest(series, origins=['202312', '202406', '202412'], horizon=6)
+
+每个 (城市, 目标) 是一条序列，特征与（5）相同（时间序号 + 月份sin/cos），对整张长表一次向量化计算。
+训练月份相同的序列合成一个多输出 XGBRegressor（multi_strategy='one_output_per_tree'，每个输出单独建树），
+各批次在进程池中并行训练。只有当 xgboost 为每个输出单独估计截距（base_score）时，多输出模型的预测才与
+逐条训练完全相同；较老的版本只估计一个所有输出共用的截距，这时自动退回每条序列一个模型（见 per_output_intercept）。
+训练好的模型以 "训练数据 + 模型参数" 的摘要为键缓存在磁盘上，数据没有变化的批次不会重训。
+回测采用滚动起点：每个起点只用起点及之前的数据训练，预测其后 horizon 个月。
+"""
+import functools
+import hashlib
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBRegressor
+
+from weather_rollup import WIND_COLUMNS
+from weather_store import DEFAULT_ROOT
+
+TARGETS = ['最高温度', '最低温度', '风力等级']
+FEATURES = ['时间序号', '月份_sin', '月份_cos']
+SERIES_KEYS = ['city', '目标']
+# 与（5）预测模型.py 相同的参数；每个模型数据很少，并行放在批次之间，单个模型只用一个线程
+MODEL_PARAMS = {'n_estimators': 100, 'learning_rate': 0.1, 'random_state': 42, 'n_jobs': 1}
+DEFAULT_CACHE_DIR = os.path.join(DEFAULT_ROOT, '_models')
+MIN_TRAIN_MONTHS = 12
+
+
+def build_series(monthly, targets=TARGETS):
+    """月度汇总 -> 长表 city, 目标, 年, 月, 值
+
+    最高温度/最低温度为当月平均值；风力等级为白天风力等级的当月平均（1-2级记1，3-4级记2，…，>7级记6）。
+    """
+    days = monthly[WIND_COLUMNS].to_numpy('float64')
+    values = pd.DataFrame({
+        '最高温度': monthly['最高温度_和'] / monthly['最高温度_天数'],
+        '最低温度': monthly['最低温度_和'] / monthly['最低温度_天数'],
+        '风力等级': days @ np.arange(1, len(WIND_COLUMNS) + 1) / days.sum(axis=1),
+    }, index=monthly.index)[list(targets)]
+    series = pd.concat([monthly[['city', '年', '月']], values], axis=1).melt(
+        id_vars=['city', '年', '月'], var_name='目标', value_name='值')
+    series = series.dropna(subset=['值'])
+    series['city'] = series['city'].astype('category')
+    series['目标'] = series['目标'].astype(pd.CategoricalDtype(list(targets)))
+    return series[SERIES_KEYS + ['年', '月', '值']].sort_values(SERIES_KEYS + ['年', '月'], ignore_index=True)
+
+
+def add_features(frame, base_year=2022):
+    """时间序号（base_year 年1月为1）和月份的sin/cos，与（5）预测模型.py 一致"""
+    frame = frame.copy()
+    frame['时间序号'] = (frame['年'] - base_year) * 12 + frame['月']
+    frame['月份_sin'] = np.sin(2 * np.pi * frame['月'] / 12)
+    frame['月份_cos'] = np.cos(2 * np.pi * frame['月'] / 12)
+    return frame
+
+
+def _year_month(frame):
+    return frame['年'] * 100 + frame['月']
+
+
+def future_months(series, train_end, horizon):
+    """每条序列在 train_end（'YYYYMM'）之后 horizon 个月的行；数据中已有的月份带上实际值"""
+    end = pd.Period(f"{train_end[:4]}-{train_end[4:]}", freq='M')
+    months = pd.period_range(end + 1, periods=horizon, freq='M')
+    keys = series[SERIES_KEYS].drop_duplicates()
+    grid = keys.merge(pd.DataFrame({'年': months.year, '月': months.month}), how='cross')
+    return grid.merge(series, on=SERIES_KEYS + ['年', '月'], how='left')
+
+
+@functools.lru_cache(maxsize=None)
+def per_output_intercept():
+    """当前 xgboost 的多输出模型是否为每个输出单独估计 base_score
+
+    用两条截距相差很大的小序列试训一次：学到的 base_score 是向量时每个输出从自己的截距开始提升，
+    与逐条训练的结果相同；是标量时所有输出共用一个混合截距，各输出的树和预测都会变。
+    """
+    X = np.arange(8, dtype='float64').reshape(-1, 1)
+    Y = np.column_stack([X[:, 0], X[:, 0] + 100])
+    model = XGBRegressor(n_estimators=1, n_jobs=1, multi_strategy='one_output_per_tree').fit(X, Y)
+    config = json.loads(model.get_booster().save_config())
+    return config['learner']['learner_model_param']['base_score'].startswith('[')
+
+
+def _fit_one(args):
+    """进程池中执行：训练一个批次的模型；多条序列时每个输出单独建树（截距见 per_output_intercept）"""
+    X, Y, params = args
+    if Y.shape[1] == 1:
+        return XGBRegressor(**params).fit(X, Y[:, 0])
+    return XGBRegressor(**params, multi_strategy='one_output_per_tree').fit(X, Y)
+
+
+class ForecastEngine:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, n_jobs=None, batch_size=64, base_year=2022, **params):
+        """cache_dir=None 不缓存模型；n_jobs 为训练进程数（默认CPU核数，1 表示在当前进程内训练）
+
+        训练月份完全相同的序列最多 batch_size 条合成一个多输出模型（一批一次训练、一次预测、一个缓存文件）。
+        xgboost 不能为每个输出单独估计截距时 batch_size 固定为1，保证结果与逐条训练相同。
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.batch_size = batch_size if batch_size == 1 or per_output_intercept() else 1
+        self.base_year = base_year
+        self.params = {**MODEL_PARAMS, **params}
+        self.stats = Counter()
+
+    def _key(self, X, Y):
+        """模型的数据版本：训练数据和模型参数的摘要"""
+        digest = hashlib.sha1(json.dumps(self.params, sort_keys=True).encode())
+        digest.update(X.tobytes())
+        digest.update(Y.tobytes())
+        return digest.hexdigest()
+
+    def _model_path(self, key):
+        return self.cache_dir / f"{key}.ubj"
+
+    def _load(self, key):
+        if self.cache_dir is None or not self._model_path(key).exists():
+            return None
+        model = XGBRegressor()
+        model.load_model(self._model_path(key))
+        return model
+
+    def _save(self, key, model):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，并行的多次运行不会读到写了一半的模型
+        tmp = self.cache_dir / f"{key}.{os.getpid()}.tmp.ubj"
+        model.save_model(tmp)
+        os.replace(tmp, self._model_path(key))
+
+    def _train(self, jobs):
+        if self.n_jobs == 1 or len(jobs) < 2:
+            return [_fit_one(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(jobs))) as pool:
+            return list(pool.map(_fit_one, jobs))
+
+    def _batches(self, train, by):
+        """按 by 分组后，把训练特征完全相同的序列切成不超过 batch_size 条的批次：[(X, Y, [分组键, ...]), ...]"""
+        buckets = {}
+        for name, group in train.groupby(by, observed=True, sort=True):
+            if len(group) < MIN_TRAIN_MONTHS:
+                self.stats['skipped'] += 1
+                continue
+            X = group[FEATURES].to_numpy('float64')
+            X, names, values = buckets.setdefault(X.tobytes(), (X, [], []))
+            names.append(name)
+            values.append(group['值'].to_numpy('float64'))
+        batches = []
+        for X, names, values in buckets.values():
+            for i in range(0, len(names), self.batch_size):
+                batches.append((X, np.column_stack(values[i:i + self.batch_size]), names[i:i + self.batch_size]))
+        return batches
+
+    def fit(self, train, by=SERIES_KEYS):
+        """按 by 分组，每条序列训练（或从缓存读取）一个模型，返回 {分组键: (模型, 输出列号)}
+
+        train 需已有特征列，并按月份排序；训练月份少于 MIN_TRAIN_MONTHS 的序列跳过。
+        """
+        models, pending = {}, []
+        for X, Y, names in self._batches(train, by):
+            key = self._key(X, Y)
+            model = self._load(key)
+            if model is None:
+                pending.append((key, X, Y, names))
+                continue
+            models.update((name, (model, column)) for column, name in enumerate(names))
+            self.stats['cached'] += len(names)
+        fitted = self._train([(X, Y, self.params) for _, X, Y, _ in pending])
+        for (key, _, _, names), model in zip(pending, fitted):
+            self._save(key, model)
+            models.update((name, (model, column)) for column, name in enumerate(names))
+            self.stats['trained'] += len(names)
+        return models
+
+    def predict(self, models, frame, by=SERIES_KEYS):
+        """为 frame 的每一行写入 预测 列（没有模型的序列为空）；同一批次的序列一次预测"""
+        frame = frame.copy()
+        by_model = {}
+        for name, index in frame.groupby(by, observed=True, sort=False).indices.items():
+            if name in models:
+                model, column = models[name]
+                rows, columns = by_model.setdefault(id(model), (model, [], []))[1:]
+                rows.append(index)
+                columns.append(np.full(len(index), column))
+        prediction = np.full(len(frame), np.nan)
+        X = frame[FEATURES].to_numpy('float64')
+        for model, rows, columns in by_model.values():
+            rows, columns = np.concatenate(rows), np.concatenate(columns)
+            values = model.predict(X[rows]).reshape(len(rows), -1)
+            prediction[rows] = values[np.arange(len(rows)), columns]
+        frame['预测'] = prediction
+        return frame
+
+    def forecast(self, series, train_end, horizon=6):
+        """用 train_end（'YYYYMM'，含）及之前的数据训练，预测之后 horizon 个月
+
+        返回 city, 目标, 年, 月, 值（实际值，未来月份为空）, 预测, 误差。
+        """
+        train = add_features(series[_year_month(series) <= int(train_end)], self.base_year)
+        target = add_features(future_months(series, train_end, horizon), self.base_year)
+        result = self.predict(self.fit(train), target)
+        result['误差'] = result['预测'] - result['值']
+        return result[SERIES_KEYS + ['年', '月', '值', '预测', '误差']]
+
+    def backtest(self, series, origins, horizon=6):
+        """滚动起点回测：每个起点（'YYYYMM'）只用起点及之前的数据训练，预测其后 horizon 个月
+
+        所有起点、所有序列的模型放在一批里并行训练。返回逐月明细（含 起点 列），
+        可再用 backtest_summary 汇总成每条序列的误差。
+        """
+        by = ['起点'] + SERIES_KEYS
+        trains, targets = [], []
+        for origin in origins:
+            trains.append(series[_year_month(series) <= int(origin)].assign(起点=origin))
+            targets.append(future_months(series, origin, horizon).assign(起点=origin))
+        train = add_features(pd.concat(trains, ignore_index=True), self.base_year)
+        target = add_features(pd.concat(targets, ignore_index=True), self.base_year)
+        result = self.predict(self.fit(train, by), target, by).dropna(subset=['值', '预测'])
+        result['误差'] = result['预测'] - result['值']
+        return result[by + ['年', '月', '值', '预测', '误差']].reset_index(drop=True)
+
+
+def backtest_summary(errors):
+    """回测明细 -> 每条序列的 MAE、RMSE 和参与评估的月数"""
+    grouped = errors.assign(绝对误差=errors['误差'].abs(), 平方误差=errors['误差'] ** 2).groupby(
+        SERIES_KEYS, observed=True)
+    return pd.DataFrame({
+        'MAE': grouped['绝对误差'].mean(),
+        'RMSE': np.sqrt(grouped['平方误差'].mean()),
+        '月数': grouped.size(),
+    }).reset_index()
@@ -0,0 +1,164 @@
+"""天气爬虫共用的"礼貌"请求工具：按主机限速、失败重试退避、自适应并发"""
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HostRateLimiter:
+    """按主机限速：同一主机每秒最多rate个请求（令牌桶，最多积攒burst个），线程安全"""
+
+    def __init__(self, rate=2.0, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._next_free = {}  # 主机 -> 下一个可用发送时刻
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """阻塞到该主机允许发送下一个请求为止"""
+        host = urlparse(url).netloc
+        interval = 1.0 / self.rate
+        with self._lock:
+            now = time.monotonic()
+            # 空闲时最多可以提前burst个间隔，即允许短时突发
+            slot = max(self._next_free.get(host, now), now - (self.burst - 1) * interval)
+            self._next_free[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RetryPolicy:
+    """失败重试策略：429/5xx和网络异常时指数退避（带随机抖动），优先遵守Retry-After"""
+
+    def __init__(self, retries=3, backoff=1.0, max_backoff=30.0, statuses=RETRY_STATUSES):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def delay(self, attempt, response=None):
+        """第attempt次（从0开始）失败后应等待的秒数"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+
+class AdaptiveConcurrency:
+    """根据延迟和错误率调整并发数（加性增、乘性减）
+
+    连续success_window个请求成功且延迟低于target_latency时并发数+1；
+    遇到429/5xx或延迟超过target_latency两倍时并发数减半。
+    """
+
+    def __init__(self, start=5, minimum=1, maximum=16, target_latency=2.0, success_window=5):
+        self.limit = start
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.success_window = success_window
+        self._active = 0
+        self._streak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record(self, latency, status):
+        """记录一次请求结果（status为None表示网络异常）"""
+        with self._cond:
+            if status is None or status in RETRY_STATUSES or latency > 2 * self.target_latency:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._streak = 0
+            elif latency < self.target_latency:
+                self._streak += 1
+                if self._streak >= self.success_window and self.limit < self.maximum:
+                    self.limit += 1
+                    self._streak = 0
+                    self._cond.notify_all()
+
+    def limited(self, func):
+        """包装func，使同时运行的调用数受当前并发上限约束"""
+
+        def run(item):
+            self.acquire()
+            try:
+                return func(item)
+            finally:
+                self.release()
+
+        return run
+
+    def map(self, func, items):
+        """与 executor.map 相同（按输入顺序返回结果），但同时运行的任务数受当前并发上限约束"""
+        with ThreadPoolExecutor(max_workers=self.maximum) as executor:
+            yield from executor.map(self.limited(func), items)
+
+
+def polite_get(session, url, limiter=None, retry=None, observer=None, timeout=15, **kwargs):
+    """限速 + 重试的GET请求，返回最后一次的响应；重试用尽仍是网络异常时抛出
+
+    observer 为 AdaptiveConcurrency 时，每次请求的延迟和状态码都会反馈给它。
+    """
+    retry = retry or RetryPolicy(retries=0)
+    for attempt in range(retry.retries + 1):
+        if limiter is not None:
+            limiter.wait(url)
+        start = time.monotonic()
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            if observer is not None:
+                observer.record(time.monotonic() - start, None)
+            if attempt == retry.retries:
+                raise
+            time.sleep(retry.delay(attempt))
+            continue
+
+        if observer is not None:
+            observer.record(time.monotonic() - start, response.status_code)
+        if response.status_code not in retry.statuses or attempt == retry.retries:
+            return response
+        print(f"{url} 返回 {response.status_code}，第{attempt + 1}次重试")
+        time.sleep(retry.delay(attempt, response))
+    return response
+
+
+PoliteClient = namedtuple('PoliteClient', ['session', 'limiter', 'retry', 'concurrency'])
+
+
+def make_polite_client(headers=None, max_workers=5, rate=2.0, burst=2, retries=3, backoff=1.0, adaptive=False,
+                       pool_size=None):
+    """各爬虫共用的请求配置，返回 PoliteClient(session, limiter, retry, concurrency)
+
+    - session：带 headers 的共享会话，连接池与线程数匹配（默认 max(max_workers, 16)），避免多线程时连接被丢弃重建
+    - limiter：按主机限速（代替在结果循环里sleep）；retry：429/5xx和网络异常的重试退避
+    - concurrency：adaptive=True 时为根据延迟和429/5xx比例调整并发数的 AdaptiveConcurrency，否则为None
+    """
+    pool_size = pool_size or max(max_workers, 16)
+    session = requests.Session()
+    session.headers.update(headers or {})
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    limiter = HostRateLimiter(rate=rate, burst=burst)
+    retry = RetryPolicy(retries=retries, backoff=backoff)
+    concurrency = AdaptiveConcurrency(start=max_workers, maximum=pool_size) if adaptive else None
+    return PoliteClient(session, limiter, retry, concurrency)
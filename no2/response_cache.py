@@ -0,0 +1,86 @@
+"""本地HTTP响应缓存：按URL保存压缩后的页面和 ETag/Last-Modified
+
+    immutable=True   内容不会再变（已结束月份的历史页面）：有缓存就直接返回，不发请求
+    immutable=False  内容可能变化（当月页面）：带 If-None-Match/If-Modified-Since 做条件请求，
+                     服务器返回304时使用缓存
+传入 validate(正文) 时，校验不通过的200响应（反爬页、没有数据的空页面）不写入缓存，
+已缓存的这类页面也视为未缓存，下次照常重新下载。
+缓存用一个SQLite文件保存，多个下载线程共享同一个连接（加锁）。
+"""
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from polite_http import polite_get
+
+DEFAULT_CACHE = 'weather_http_cache.sqlite'
+
+CachedResponse = namedtuple('CachedResponse', ['status_code', 'content', 'headers', 'from_cache'])
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                immutable INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self._lock = threading.Lock()
+        self.stats = {'hit': 0, 'revalidated': 0, 'fetched': 0}
+
+    def _lookup(self, url):
+        with self._lock:
+            return self.conn.execute(
+                'SELECT body, etag, last_modified, immutable FROM responses WHERE url = ?', (url,)).fetchone()
+
+    def _store(self, url, body, etag, last_modified, immutable):
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                              (url, zlib.compress(body, 6), etag, last_modified, int(immutable), time.time()))
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, session, url, immutable=False, limiter=None, retry=None, observer=None, timeout=15, validate=None):
+        """带缓存的GET，参数与 polite_get 相同；返回 CachedResponse（from_cache 表示未下载正文）
+
+        validate(正文) 返回False的页面不缓存，缓存中已有的这类页面也不使用。
+        """
+        entry = self._lookup(url)
+        if entry is not None and validate is not None and not validate(zlib.decompress(entry[0])):
+            entry = None
+        if entry is not None and entry[3]:
+            self._count('hit')
+            return CachedResponse(200, zlib.decompress(entry[0]), {}, True)
+
+        headers = {}
+        if entry is not None:
+            if entry[1]:
+                headers['If-None-Match'] = entry[1]
+            if entry[2]:
+                headers['If-Modified-Since'] = entry[2]
+        response = polite_get(session, url, limiter, retry, observer, timeout, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            body = zlib.decompress(entry[0])
+            # 月份结束后最后一次确认未变化，之后不再请求
+            self._store(url, body, entry[1], entry[2], immutable)
+            self._count('revalidated')
+            return CachedResponse(200, body, response.headers, True)
+        if response.status_code == 200 and (validate is None or validate(response.content)):
+            self._store(url, response.content, response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'), immutable)
+            self._count('fetched')
+        return CachedResponse(response.status_code, response.content, response.headers, False)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,141 @@
+"""天气后报月度页面解析（各爬虫脚本和批量调度器共用）
+
+可选解析后端，输出完全相同：
+    lxml      lxml.html 直接解析，XPath取表格（最快，默认）
+    strainer  BeautifulSoup + SoupStrainer，只为第一个<table>建树
+    bs4       原始实现：html.parser 为整页建树
+未安装 lxml 时默认退回 strainer。
+"""
+import re
+from datetime import date, datetime
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml 是可选依赖
+    lxml = None
+
+DATE_PATTERN = re.compile(r'(\d{1,2})月(\d{1,2})日')
+TEMP_PATTERN = re.compile(r'-?\d+')
+TABLE_PATTERN = re.compile(rb'<table[\s>]', re.IGNORECASE)
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+BACKENDS = ('lxml', 'strainer', 'bs4')
+DEFAULT_BACKEND = 'lxml' if lxml is not None else 'strainer'
+
+
+def is_closed(year_month, today=None):
+    """该月是否已经结束（结束的月份页面不会再变化，抓过一次即可）"""
+    today = today or date.today()
+    return year_month < f"{today.year}{today.month:02d}"
+
+
+def has_weather_table(body):
+    """页面字节中是否有天气表格；反爬页、空页面虽然返回200，但没有表格，不能当作有效页面缓存"""
+    return TABLE_PATTERN.search(body) is not None
+
+
+def _bs4_rows(html_content, strainer=False):
+    """返回第一个表格除表头外每行各单元格的文本；没有表格时返回None"""
+    if strainer:
+        soup = BeautifulSoup(html_content, 'lxml' if lxml is not None else 'html.parser',
+                             parse_only=SoupStrainer('table'))
+    else:
+        soup = BeautifulSoup(html_content, 'html.parser')
+    table = soup.find('table')
+    if not table:
+        return None
+    return [[td.get_text(strip=True) for td in row.find_all('td')]
+            for row in table.find_all('tr')[1:]]  # 跳过表头行
+
+
+def _lxml_text(element):
+    """与 get_text(strip=True) 相同：每段文本去掉首尾空白后直接拼接"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def _lxml_rows(html_content):
+    # 已解码的str带 <?xml ... encoding=...?> 声明时 lxml 会报 ValueError，bs4 则直接忽略；先去掉声明
+    html_content = XML_DECLARATION.sub('', html_content, count=1)
+    if not html_content.strip():
+        return None
+    table = next(lxml.html.fromstring(html_content).iter('table'), None)
+    if table is None:
+        return None
+    return [[_lxml_text(td) for td in row.iter('td')]
+            for row in list(table.iter('tr'))[1:]]
+
+
+def _parse_row(cols, year):
+    """一行单元格文本 -> 一条记录；无效行返回None"""
+    # 数据有效性检查
+    if len(cols) < 4 or not cols[0]:
+        return None
+
+    # 提取日期
+    match = DATE_PATTERN.search(cols[0])
+    if not match:
+        return None
+
+    # 创建标准日期格式
+    try:
+        date = datetime(year, int(match.group(1)), int(match.group(2))).strftime('%Y-%m-%d')
+    except ValueError:
+        # 处理无效日期（如2月30日）
+        return None
+
+    # 提取天气状况
+    weather = cols[1]
+    day_weather, night_weather = weather.split('/') if '/' in weather else (weather, weather)
+
+    # 提取温度
+    temp_nums = TEMP_PATTERN.findall(cols[2])
+    if len(temp_nums) < 2:
+        return None
+
+    # 提取风力风向
+    wind = cols[3]
+    day_wind, night_wind = wind.split('/') if '/' in wind else (wind, wind)
+
+    return {
+        '日期': date,
+        '白天天气': day_weather.strip(),
+        '夜晚天气': night_weather.strip(),
+        '最高温度': temp_nums[0],
+        '最低温度': temp_nums[1],
+        '白天风力': day_wind.strip(),
+        '夜晚风力': night_wind.strip()
+    }
+
+
+def parse_weather_table(html_content, year_month, backend=None):
+    """解析天气表格数据，year_month 形如 '202201'（页面上的日期只有月和日）"""
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'lxml':
+        rows = _lxml_rows(html_content)
+    elif backend in ('strainer', 'bs4'):
+        rows = _bs4_rows(html_content, strainer=backend == 'strainer')
+    else:
+        raise ValueError(f"未知的解析后端: {backend}，可选 {BACKENDS}")
+
+    if rows is None:
+        print("未找到天气数据表格")
+        return []
+
+    # 从URL中获取年份
+    year = int(year_month[:4])
+    data = []
+    for cols in rows:
+        try:
+            record = _parse_row(cols, year)
+        except Exception as e:
+            print(f"处理行时出错: {e}")
+            continue
+        if record is not None:
+            data.append(record)
+    return data
+
+
+def parse_page(body, year_month, backend=None):
+    """解析原始页面字节（UTF-8）；供进程池调用，解码也放在子进程里完成"""
+    return parse_weather_table(body.decode('utf-8', errors='replace'), year_month, backend)
@@ -0,0 +1,128 @@
+"""逐月汇总（rollup）：数据写入 weather_store 时按 城市/年/月 预先聚合，分析脚本直接查询汇总
+
+    weather_store/_rollup/monthly.parquet   每月天数、最高/最低温度的和与平方和、各风力等级天数
+    weather_store/_rollup/weather.parquet   每月白天/夜晚各（天气, 转为）组合的天数（长表，两列均为词表分类）
+
+只保存可以相加的量（天数、和、平方和），任意粒度的均值和标准差都能由它们精确合并出来。
+新月份写入时只重算这些月份对应的汇总行，其余行不动。
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from weather_vocab import as_conditions, split_conditions
+from wind import WIND_LEVELS, classify_wind_levels
+
+KEYS = ['city', '年', '月']
+TEMPERATURE_COLUMNS = ['最高温度', '最低温度']
+WIND_COLUMNS = [f'风力_{level}' for level in WIND_LEVELS]
+
+
+CONDITION_KEYS = ['天气', '转为']
+
+
+def _conditions(daily, period):
+    """取入库时编码好的 状况/转为 列；没有时由原始天气字符串现场编码"""
+    if f'{period}状况' in daily.columns:
+        return daily[f'{period}状况'], daily[f'{period}转为']
+    return split_conditions(daily[f'{period}天气'])
+
+
+def summarize_months(daily, city):
+    """逐日数据 -> (月度汇总, 天气类型计数)；daily 中每个月份都应是完整的分区数据"""
+    daily = daily.assign(city=city, 年=daily['日期'].dt.year, 月=daily['日期'].dt.month)
+    for column in TEMPERATURE_COLUMNS:
+        value = daily[column].astype('float64')
+        daily[f'{column}_和'] = value
+        daily[f'{column}_平方和'] = value ** 2
+        daily[f'{column}_天数'] = value.notna().astype('int64')
+
+    sums = [f'{column}_{kind}' for column in TEMPERATURE_COLUMNS for kind in ('和', '平方和', '天数')]
+    monthly = daily.groupby(KEYS)[sums].sum()
+    monthly.insert(0, '天数', daily.groupby(KEYS).size())
+
+    wind = daily.assign(风力分类=classify_wind_levels(daily['白天风力']))
+    wind_counts = wind.groupby(KEYS + ['风力分类'], observed=True).size().unstack(fill_value=0)
+    wind_counts = wind_counts.reindex(columns=WIND_LEVELS, fill_value=0)
+    wind_counts.columns = WIND_COLUMNS
+    monthly = monthly.join(wind_counts).reset_index()
+
+    weather = pd.concat([
+        daily[KEYS].assign(时段=period, **dict(zip(CONDITION_KEYS, _conditions(daily, period))))
+        for period in ('白天', '夜晚')
+    ])
+    # 分组键是分类编码；没有转变的行 转为 为空，也要计数
+    weather_counts = (weather.groupby(KEYS + ['时段'] + CONDITION_KEYS, observed=True, dropna=False)
+                      .size().rename('天数').reset_index())
+    return monthly, weather_counts
+
+
+class WeatherRollup:
+    def __init__(self, root):
+        self.dir = Path(root) / '_rollup'
+        self.monthly_path = self.dir / 'monthly.parquet'
+        self.weather_path = self.dir / 'weather.parquet'
+
+    def exists(self):
+        """两个汇总文件都在，且天气计数已按（天气, 转为）编码（早期的汇总没有 转为 列，需要重建）"""
+        if not (self.monthly_path.exists() and self.weather_path.exists()):
+            return False
+        return '转为' in pq.read_schema(self.weather_path).names
+
+    def _replace(self, path, new_rows, keys):
+        """用新行替换 keys 相同的旧行后写回（先写临时文件再替换）"""
+        if path.exists():
+            old = as_conditions(pd.read_parquet(path), CONDITION_KEYS)
+            stale = old.set_index(KEYS).index.isin(keys)
+            new_rows = pd.concat([old[~stale], new_rows], ignore_index=True)[new_rows.columns]
+        new_rows = new_rows.sort_values(KEYS, ignore_index=True)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        new_rows.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def update(self, daily, city):
+        """重算 daily 所覆盖月份的汇总行（daily 为这些月份合并后的完整数据）"""
+        monthly, weather_counts = summarize_months(daily, city)
+        keys = monthly.set_index(KEYS).index
+        self._replace(self.monthly_path, monthly, keys)
+        self._replace(self.weather_path, weather_counts, keys)
+
+    def _read(self, path, cities, start, end):
+        df = as_conditions(pd.read_parquet(path), CONDITION_KEYS)
+        year_month = df['年'] * 100 + df['月']
+        mask = pd.Series(True, index=df.index)
+        if cities:
+            mask &= df['city'].isin(cities)
+        if start:
+            mask &= year_month >= int(start)
+        if end:
+            mask &= year_month <= int(end)
+        return df[mask].reset_index(drop=True)
+
+    def monthly(self, cities=None, start=None, end=None):
+        """月度汇总表，start/end 为 'YYYYMM'（含）"""
+        return self._read(self.monthly_path, cities, start, end)
+
+    def weather_counts(self, cities=None, start=None, end=None):
+        """天气类型计数长表：city, 年, 月, 时段, 天气, 转为, 天数
+
+        天气 为起始状况（"晴转多云" 记为 晴），转为 为转变后的状况（没有转变时为空），均为 CONDITION_DTYPE 分类。
+        """
+        return self._read(self.weather_path, cities, start, end)
+
+
+def temperature_stats(monthly, by):
+    """按 by 合并月度汇总，得到各温度列的均值和（样本）标准差，与对逐日数据 groupby 的结果一致"""
+    sums = monthly.groupby(by).sum(numeric_only=True)
+    result = pd.DataFrame(index=sums.index)
+    for column in TEMPERATURE_COLUMNS:
+        n = sums[f'{column}_天数']
+        total = sums[f'{column}_和']
+        result[f'{column}_均值'] = total / n
+        variance = (sums[f'{column}_平方和'] - total ** 2 / n) / (n - 1)
+        result[f'{column}_标准差'] = np.sqrt(variance.clip(lower=0))
+    return result.reset_index()
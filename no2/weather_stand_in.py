@@ -0,0 +1,110 @@
+"""本地天气后报替身站点：按 /lishi/{城市}/month/{YYYYMM}.html 返回月度页面，用于离线测试爬虫
+
+fixtures 目录下有 {城市}/{YYYYMM}.html 时原样返回（可以放真实保存下来的页面），
+否则按城市和月份生成确定性的合成页面（表格结构与真实页面相同）。
+
+用法：
+    python weather_stand_in.py [fixtures目录] [端口]
+    # 然后把爬虫的 base_url 设为 'http://127.0.0.1:8766'
+"""
+import calendar
+import hashlib
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PATH_PATTERN = re.compile(r'^/lishi/(\w+)/month/(\d{4})(\d{2})\.html$')
+CONDITIONS = ['晴', '多云', '阴', '小雨', '中雨', '阵雨', '雷阵雨', '小雪', '雾']
+WINDS = ['北风', '南风', '东风', '西风', '东北风', '西南风', '东南风', '西北风']
+LEVELS = ['1-2级', '3-4级', '4-5级', '5-6级', '6-7级', '微风']
+
+
+def synthetic_month_page(city, year, month):
+    """生成某城市某月的合成页面，同一城市和月份每次生成的内容相同"""
+    rng = random.Random(f"{city}{year}{month}")
+    base = 25 * (1 - abs(month - 7) / 6) - 5
+    rows = []
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        high = round(base + rng.uniform(0, 8))
+        low = high - rng.randint(3, 12)
+        day_condition, night_condition = rng.choice(CONDITIONS), rng.choice(CONDITIONS)
+        if rng.random() < 0.2:
+            day_condition += '转' + rng.choice(CONDITIONS)
+        rows.append(
+            f'<tr><td><a href="/lishi/{city}/{year}{month:02d}{day:02d}.html">{year}年{month:02d}月{day:02d}日</a></td>'
+            f'<td>{day_condition} /{night_condition}</td>'
+            f'<td>{high}℃ / {low}℃</td>'
+            f'<td>{rng.choice(WINDS)} {rng.choice(LEVELS)} /{rng.choice(WINDS)} {rng.choice(LEVELS)}</td></tr>')
+    return ('<html><head><meta charset="utf-8"><title>{} {}年{}月天气</title></head><body>'
+            '<table><tr><td>日期</td><td>天气状况</td><td>气温</td><td>风力风向</td></tr>{}</table>'
+            '</body></html>').format(city, year, month, ''.join(rows))
+
+
+def make_server(fixtures=None, port=0, delay=0.0, error_rate=0.0, seed=0):
+    """创建替身站点（未启动）。delay 模拟网络延迟（秒）；error_rate 按概率返回429，用于测试重试
+
+    server.hits 统计每个路径被请求的次数，可用来验证断点续爬没有重复抓取；
+    页面带 ETag，请求的 If-None-Match 一致时返回304。
+    """
+    fixtures = Path(fixtures) if fixtures else None
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                server.hits[self.path] += 1
+                throttled = rng.random() < error_rate
+            if delay:
+                time.sleep(delay)
+            match = PATH_PATTERN.match(self.path)
+            if throttled:
+                self._send(429, b'', {'Retry-After': '0'})
+            elif not match:
+                self._send(404, b'not found')
+            else:
+                city, year, month = match.group(1), int(match.group(2)), int(match.group(3))
+                saved = fixtures / city / f"{year}{month:02d}.html" if fixtures else None
+                if saved is not None and saved.exists():
+                    body = saved.read_bytes()
+                else:
+                    body = synthetic_month_page(city, year, month).encode('utf-8')
+                etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', {'ETag': etag})
+                else:
+                    self._send(200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag})
+
+        def _send(self, status, body, headers=None):
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.hits = Counter()
+    return server
+
+
+def serve_in_thread(**kwargs):
+    """在后台线程启动替身站点，返回 (server, base_url)；用完调用 server.shutdown()"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8766
+    print(f"替身站点已启动: http://127.0.0.1:{port}")
+    make_server(fixtures_dir, port).serve_forever()
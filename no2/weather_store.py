@@ -0,0 +1,169 @@
+"""按 城市/年/月 分区的逐日天气Parquet数据集
+
+    weather_store/city=dalian/year=2022/month=01/part-0.parquet
+
+每次爬取只追加（或覆盖）新爬到的月份分区，不再整表重写Excel；分析脚本按城市和年月范围
+只读取需要的分区。Excel只作为可选的导出格式。
+第一次读取时如果数据集为空，会从已有的 dalian_weather_*.xlsx 导入。
+写入分区的同时更新逐月汇总（见 weather_rollup）。
+入库时天气状况按固定词表编码为 白天状况/白天转为/夜晚状况/夜晚转为 四个分类列（见 weather_vocab），
+原始字符串列保留不变。
+"""
+import os
+import re
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from weather_rollup import WeatherRollup
+from weather_vocab import add_condition_columns, as_conditions
+
+DEFAULT_ROOT = 'weather_store'
+# 已有的Excel结果（后一个包含前一个），数据集为空时按顺序导入
+BOOTSTRAP_FILES = ['dalian_weather_2022-2024.xlsx', 'dalian_weather_2022-2024+2025.1-6.xlsx']
+RAW_SCHEMA = pa.schema([
+    ('日期', pa.timestamp('ms')),
+    ('白天天气', pa.string()),
+    ('夜晚天气', pa.string()),
+    ('最高温度', pa.int16()),
+    ('最低温度', pa.int16()),
+    ('白天风力', pa.string()),
+    ('夜晚风力', pa.string()),
+])
+CONDITION_COLUMNS = ['白天状况', '白天转为', '夜晚状况', '夜晚转为']
+SCHEMA = pa.schema(list(RAW_SCHEMA) + [pa.field(column, pa.dictionary(pa.int8(), pa.string()))
+                                       for column in CONDITION_COLUMNS])
+PARTITION_PATTERN = re.compile(r'city=(\w+)[/\\]year=(\d{4})[/\\]month=(\d{2})$')
+
+
+def _normalize(df, keep='first'):
+    """整理为固定的列和类型：日期转为datetime，温度转为整数，去掉无效日期和重复日期，并编码天气状况
+
+    同一批数据中同一天出现多次时保留第一次（与原来导出Excel前 keep='first' 的规则相同）；
+    与已有分区合并时传 keep='last'，让新爬到的数据覆盖分区中的旧数据。
+    """
+    df = df[RAW_SCHEMA.names].copy()
+    df['日期'] = pd.to_datetime(df['日期'], errors='coerce')
+    df = df.dropna(subset=['日期'])
+    for column in ('最高温度', '最低温度'):
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int16')
+    df = df.drop_duplicates(subset=['日期'], keep=keep).sort_values('日期', kind='stable')
+    return add_condition_columns(df)
+
+
+def _read_partition(path, columns=None):
+    """读取一个分区文件；早期写入、还没有状况编码列的分区读取原始列后现场编码"""
+    names = pq.read_schema(path).names
+    if columns is not None and all(column in names for column in columns):
+        df = pq.read_table(path, columns=columns).to_pandas()
+    elif all(column in names for column in CONDITION_COLUMNS):
+        df = pq.read_table(path).to_pandas()
+    else:
+        df = _normalize(pq.read_table(path, columns=RAW_SCHEMA.names).to_pandas())
+    if columns is not None:
+        df = df[columns]
+    return as_conditions(df, CONDITION_COLUMNS)
+
+
+class WeatherStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = Path(root)
+        self.rollup = WeatherRollup(root)
+
+    def _partition_dir(self, city, year, month):
+        return self.root / f"city={city}" / f"year={year}" / f"month={month:02d}"
+
+    def partitions(self, cities=None, start=None, end=None):
+        """已有的分区 [(城市, 年, 月), ...]；start/end 为 'YYYYMM'（含）"""
+        result = []
+        for path in self.root.glob('city=*/year=*/month=*'):
+            match = PARTITION_PATTERN.search(str(path))
+            if not match:
+                continue
+            city, year, month = match.group(1), int(match.group(2)), int(match.group(3))
+            year_month = f"{year}{month:02d}"
+            if cities and city not in cities:
+                continue
+            if (start and year_month < start) or (end and year_month > end):
+                continue
+            result.append((city, year, month))
+        return sorted(result)
+
+    def has_month(self, city, year, month):
+        return (self._partition_dir(city, year, month) / 'part-0.parquet').exists()
+
+    def append(self, df, city):
+        """写入一个城市的逐日数据：按年月拆分，新月份新建分区，已有月份与旧数据合并后覆盖
+
+        写入后只重算这些月份的汇总行（汇总需要重建时整体重建）。
+        """
+        df = _normalize(df)
+        written = []
+        for (year, month), part in df.groupby([df['日期'].dt.year, df['日期'].dt.month]):
+            path = self._partition_dir(city, year, month) / 'part-0.parquet'
+            if path.exists():
+                part = _normalize(pd.concat([_read_partition(path, RAW_SCHEMA.names), part]), keep='last')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，写到一半中断也不会留下损坏的分区
+            tmp = path.with_suffix('.tmp')
+            pq.write_table(pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False), tmp)
+            os.replace(tmp, path)
+            written.append(part)
+        if written and self.rollup.exists():
+            self.rollup.update(pd.concat(written, ignore_index=True), city)
+        elif written:
+            # 汇总不存在或是按旧规则生成的，整体重建（已包含刚写入的分区）
+            self.rebuild_rollup()
+        return len(written)
+
+    def rebuild_rollup(self):
+        """由全部分区重建逐月汇总（汇总文件丢失或汇总规则变化时使用）"""
+        for city in sorted({city for city, _, _ in self.partitions()}):
+            self.rollup.update(self.read([city]).drop(columns='city'), city)
+
+    def read(self, cities=None, start=None, end=None, columns=None):
+        """读取指定城市和年月范围（'YYYYMM'，含）的分区，返回带 city 列的DataFrame"""
+        frames = []
+        for city, year, month in self.partitions(cities, start, end):
+            df = _read_partition(self._partition_dir(city, year, month) / 'part-0.parquet', columns)
+            frames.append(df.assign(city=city))
+        if not frames:
+            return pd.DataFrame(columns=(columns or SCHEMA.names) + ['city'])
+        df = pd.concat(frames, ignore_index=True)
+        df['city'] = df['city'].astype('category')
+        return df
+
+    def export_excel(self, filename, cities=None, start=None, end=None):
+        """导出为与原 save_to_excel 相同列的Excel（可选，只为需要表格文件的场合）"""
+        df = self.read(cities, start, end, RAW_SCHEMA.names).sort_values(['city', '日期'])
+        if cities is not None and len(cities) == 1:
+            df = df.drop(columns='city')
+        df.to_excel(filename, index=False)
+        print(f"数据已导出到 {filename}，共 {len(df)} 条记录")
+
+    def bootstrap_from_excel(self, files=BOOTSTRAP_FILES, city='dalian'):
+        """把已有的Excel结果导入数据集"""
+        for filename in files:
+            if os.path.exists(filename):
+                count = self.append(pd.read_excel(filename), city)
+                print(f"已从 {filename} 导入 {count} 个月份分区")
+
+
+def load_weather(cities=('dalian',), start=None, end=None, columns=None, root=DEFAULT_ROOT):
+    """分析脚本的读取入口：只读取需要的城市/年月分区和列；数据集为空时先从已有Excel导入"""
+    store = WeatherStore(root)
+    if not store.partitions():
+        store.bootstrap_from_excel()
+    return store.read(list(cities), start, end, columns)
+
+
+def load_rollup(root=DEFAULT_ROOT):
+    """分析脚本查询汇总的入口：数据集为空时先从已有Excel导入，汇总不存在时由分区重建"""
+    store = WeatherStore(root)
+    if not store.partitions():
+        store.bootstrap_from_excel()
+    elif not store.rollup.exists():
+        store.rebuild_rollup()
+    return store.rollup
@@ -0,0 +1,93 @@
+"""天气状况的固定词表与分类编码
+
+"晴转多云" 这类写法拆成 起始状况（晴）和 转为（多云）两个特征，都映射到同一个固定词表，
+用类别编码（int8）保存。统计、分组都在小整数上进行；词表固定，不同月份、不同城市的数据
+拼接后仍是同一个分类类型，不会退化成字符串。
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+CONDITIONS = [
+    '晴', '多云', '阴',
+    '小雨', '阵雨', '雷阵雨', '雷阵雨伴有冰雹', '中雨', '大雨', '暴雨', '大暴雨', '特大暴雨',
+    '小到中雨', '中到大雨', '大到暴雨', '暴雨到大暴雨', '冻雨',
+    '雨夹雪', '阵雪', '小雪', '中雪', '大雪', '暴雪', '小到中雪', '中到大雪', '大到暴雪',
+    '雾', '霾', '浮尘', '扬沙', '沙尘暴',
+    '其他',
+]
+OTHER = '其他'
+CONDITION_DTYPE = pd.CategoricalDtype(CONDITIONS)
+# "小雨-中雨"、"小雨~中雨" 这类范围写法统一为 "小到中雨"
+RANGE_PATTERN = re.compile(r'^([小中大暴])[雨雪]?[-~～]([中大暴])([雨雪])$')
+
+
+def normalize_condition(text):
+    """单个状况字符串 -> 词表中的状况；无法识别的归为"其他"，空值返回None"""
+    if text is None or text != text:
+        return None
+    text = re.sub(r'\s+', '', str(text)).rstrip('天')
+    if not text:
+        return None
+    text = RANGE_PATTERN.sub(r'\1到\2\3', text)
+    return text if text in CONDITION_DTYPE.categories else OTHER
+
+
+def split_conditions(series):
+    """状况列 -> (起始状况, 转为)，均为 CONDITION_DTYPE 分类；没有"转"时 转为 为空
+
+    只对去重后的取值做字符串处理，再按编码展开回所有行。
+    """
+    codes, uniques = pd.factorize(series)
+    start, after = [], []
+    for value in uniques:
+        head, _, tail = str(value).partition('转')
+        start.append(normalize_condition(head))
+        after.append(normalize_condition(tail) if tail else None)
+    start = pd.Categorical(start, dtype=CONDITION_DTYPE).take(codes, allow_fill=True)
+    after = pd.Categorical(after, dtype=CONDITION_DTYPE).take(codes, allow_fill=True)
+    return (pd.Series(start, index=series.index, name='状况'),
+            pd.Series(after, index=series.index, name='转为'))
+
+
+def transition_pairs(start, after, weights=None):
+    """(起始状况, 转为) 配对计数，只统计确有转变的行；返回以两列状况为索引的Series
+
+    起始状况缺失的行（如 '转晴'）没有可配对的一方，不计入。
+    weights 为每行代表的天数（如汇总表的 天数 列），不给时每行记1天。
+    """
+    mask = (start.notna() & after.notna()).to_numpy()
+    n = len(CONDITIONS)
+    pair_codes = start.cat.codes.to_numpy()[mask].astype(np.int32) * n + after.cat.codes.to_numpy()[mask]
+    if weights is not None:
+        weights = np.asarray(weights)[mask]
+    counts = np.bincount(pair_codes, weights=weights, minlength=n * n).astype(np.int64).reshape(n, n)
+    pairs = pd.DataFrame(counts, index=CONDITION_DTYPE.categories, columns=CONDITION_DTYPE.categories).stack()
+    pairs.index.names = ['状况', '转为']
+    return pairs[pairs > 0].rename('天数')
+
+
+def as_conditions(df, columns):
+    """把已有的状况列统一为 CONDITION_DTYPE（从Parquet读回时分类取值只含出现过的状况）
+
+    已是分类列时只重排类别、重映射编码，不经过字符串。
+    """
+    for column in columns:
+        if column not in df.columns:
+            continue
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.set_categories(CONDITIONS)
+        else:
+            df[column] = df[column].astype('string').astype(CONDITION_DTYPE)
+    return df
+
+
+def add_condition_columns(df):
+    """为白天、夜晚天气各增加 状况/转为 两列（列名以白天、夜晚开头）"""
+    for period in ('白天', '夜晚'):
+        source = f'{period}天气'
+        if source not in df.columns:
+            continue
+        df[f'{period}状况'], df[f'{period}转为'] = split_conditions(df[source])
+    return df
@@ -0,0 +1,77 @@
+"""风力风向的向量化解析与分级
+
+"东北风 3-4级"、"无持续风向 5-6级"、"南风 <3级" 这类字符串用一个预编译的正则一次
+str.extract 出风向和风力上下限，再用 np.select 分级，不再对每行调用Python函数。
+风力写法只有几十种，正则只作用于去重后的取值，再按编码展开回所有行，
+耗时基本只与行数的一次 factorize 成正比。
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+WIND_LEVELS = ['1-2级', '3-4级', '4-5级', '5-6级', '6-7级', '>7级']
+CALM = '无持续风向'
+
+# 风向 + 第一个"a-b级"（没有范围写法时取第一个"n级"）
+WIND_PATTERN = re.compile(
+    r'^\s*(?P<风向>无持续风向|[东南西北]+风)?'
+    r'(?:.*?(?:(?P<下限>\d+)-(?P<上限>\d+)级|(?!.*\d+-\d+级)(?P<单值>\d+)级))?'
+)
+
+
+def parse_wind(series):
+    """解析风力列，返回 风向（分类）、风力下限、风力上限（可空整数）三列，以及是否含无持续风向（布尔）
+
+    风向只取开头的写法；"东北风转无持续风向 3-4级" 的风向为东北风，但仍记为含无持续风向。
+    """
+    codes, uniques = pd.factorize(series)
+    values = pd.Series(uniques, dtype='string')
+    parts = values.str.extract(WIND_PATTERN)
+    # 原 classify_wind 只要字符串中出现"无持续风向"就按无风处理，不限于开头
+    calm = values.str.contains(CALM, regex=False).to_numpy(dtype=bool)
+    upper = pd.to_numeric(parts['上限'].fillna(parts['单值'])).astype('Int8')
+    lower = pd.to_numeric(parts['下限'].fillna(parts['单值'])).astype('Int8')
+    direction = parts['风向'].astype('category')
+    # 按编码展开回每一行，缺失值的编码 -1 取到空值
+    return pd.DataFrame({
+        '风向': direction.array.take(codes, allow_fill=True),
+        '风力下限': lower.array.take(codes, allow_fill=True),
+        '风力上限': upper.array.take(codes, allow_fill=True),
+        '无持续风向': np.append(calm, False)[codes],
+    }, index=series.index)
+
+
+def classify_levels(parsed):
+    """按风力上限分级（与原 classify_wind 规则一致）：
+
+    缺失、含无持续风向、无法解析的都归为1-2级；≤2 1-2级，≤4 3-4级，5 4-5级，6 5-6级，7 6-7级，>7 >7级
+    """
+    upper = parsed['风力上限'].astype('float64').to_numpy()
+    calm = parsed['无持续风向'].to_numpy(dtype=bool) | np.isnan(upper)
+    # 直接选出等级编码，避免生成大量字符串
+    codes = np.select(
+        [calm, upper <= 2, upper <= 4, upper == 5, upper == 6, upper == 7],
+        [0, 0, 1, 2, 3, 4],
+        default=5,
+    ).astype('int8')
+    return pd.Categorical.from_codes(codes, categories=WIND_LEVELS, ordered=True)
+
+
+def classify_wind_levels(series):
+    """风力字符串列 -> 有序分类的风力等级"""
+    return pd.Series(classify_levels(parse_wind(series)), index=series.index, name='风力分类')
+
+
+def add_wind_columns(df):
+    """为白天、夜晚风力各增加 风向/风力下限/风力上限/风力分类 四列（列名以白天、夜晚开头）"""
+    for period in ('白天', '夜晚'):
+        source = f'{period}风力'
+        if source not in df.columns:
+            continue
+        parsed = parse_wind(df[source])
+        df[f'{period}风向'] = parsed['风向']
+        df[f'{period}风力下限'] = parsed['风力下限']
+        df[f'{period}风力上限'] = parsed['风力上限']
+        df[f'{period}风力分类'] = classify_levels(parsed)
+    return df
@@ -1,21 +1,27 @@
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
 from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from datetime import datetime
+
+from polite_http import make_polite_client, polite_get
+from fetch_pipeline import fetch_parse_pipeline
+from response_cache import DEFAULT_CACHE, ResponseCache
+from weather_parser import has_weather_table, is_closed, parse_page, parse_weather_table
+from weather_store import DEFAULT_ROOT, WeatherStore
 
 
 class DalianWeatherScraper:
-    def __init__(self):# 是Python中用于对象初始化的方法，当创建类的新实例时，
+    def __init__(self, max_workers=5, rate=2.0, adaptive=False, parse_workers=None,
+                 cache_path=DEFAULT_CACHE, store_root=DEFAULT_ROOT, *, city='dalian'):# 是Python中用于对象初始化的方法，当创建类的新实例时，
                         # Python会自动调用这个方法。它的主要作用是为新创建的对象设置初始状态
         self.base_url = "https://www.tianqihoubao.com"
+        self.city = city  # 天气后报的城市拼音，如 dalian（仅限关键字参数）
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
         }
-        self.session = requests.Session()
-        '''创建一个持久化的会话对象,与直接使用 
+        self.max_workers = max_workers
+        # 共享会话 + 按主机限速 + 失败重试退避（+ 自适应并发），见 polite_http.make_polite_client
+        self.session, self.limiter, self.retry, self.concurrency = make_polite_client(
+            self.headers, max_workers, rate, adaptive=adaptive)
+        '''make_polite_client 中 requests.Session() 创建一个持久化的会话对象,与直接使用 
         requests.get()/requests.post() 相比有显著优势:
         TCP连接复用：
         1.保持底层TCP连接打开，避免为每个请求重新建立连接
@@ -25,16 +31,22 @@ class DalianWeatherScraper:
         保持认证信息、代理配置等
         3.共享配置：
         可以设置会话级别的headers、auth、超时等参数
-        //如果没有这行代码：
+        //如果不用会话：
         每次请求都需要单独创建新连接，性能较低
         无法自动保持cookies和会话状态
         需要为每个请求单独配置headers等参数
         '''
-        self.session.headers.update(self.headers)#将之前定义的headers应用到整个session
-        '''如果没有这行代码：
+        # session.headers.update(self.headers)：将之前定义的headers应用到整个session
+        '''如果没有这一步：
             每次发起请求都需要手动添加headers：
             response = requests.get(url, headers=self.headers)
         '''
+        # 解析进程数：None为CPU核数；0表示在下载线程中直接解析
+        self.parse_workers = parse_workers
+        # 本地响应缓存：重复运行时历史月份不再重新下载；cache_path=None 关闭
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        # 按 城市/年/月 分区的Parquet数据集，每次爬取只追加新月份
+        self.store = WeatherStore(store_root)
 
     def get_monthly_links(self, start_year=2022, end_year=2024):
         """获取2022-2024年每月天气页面的链接"""
@@ -48,7 +60,7 @@ class DalianWeatherScraper:
                         当 month = 9 → "09"
                         当 month = 12 → "12"
                 '''
-                monthly_links.append(f"/lishi/dalian/month/{month_str}.html")
+                monthly_links.append(f"/lishi/{self.city}/month/{month_str}.html")
                 '''
                     最后以列表形式返回：
                     [
@@ -62,174 +74,121 @@ class DalianWeatherScraper:
 
     def parse_weather_table(self, html_content, year_month):
         """解析天气表格数据"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        table = soup.find('table')
-
-        if not table:
-            print("未找到天气数据表格")
-            return []
-
-        data = []
-        for row in table.find_all('tr')[1:]:  # 跳过表头行
-            cols = row.find_all('td')
-            '''
-            find_all('tr')[1:]跳过表格的第一行（通常是表头）
-            获取每行中的所有<td>单元格
-            '''
+        return parse_weather_table(html_content, year_month)
 
-            if len(cols) < 4 or not cols[0].get_text(strip=True):
-                continue
-            #表格列数小于四或者存在所提取的文本为空的情况，跳过
-            try:
-                date_str = cols[0].get_text(strip=True)# 提取第1列的文本并去除首尾空格
-                match = re.search(r'(\d{1,2})月(\d{1,2})日', date_str)
-                #(\d{1,2}):匹配 1~2位数字，并捕获为分组
-                if not match:
-                    continue
-
-                month = int(match.group(1))
-                day = int(match.group(2))
-                #分别对应正则表达式里 第一个括号 和 第二个括号 捕获的内容
-                year = int(year_month[:4]) # 从"202301"中提取2023
-
-                try:
-                    date = datetime(year, month, day).strftime('%Y-%m-%d')
-                except ValueError:
-                    continue
-
-                weather = cols[1].get_text(strip=True)
-                day_weather, night_weather = weather.split('/') if '/' in weather else (weather, weather)
-                #(weather, weather):即原字符串重复两次的元组,即为使用相同值
-                #weather.split('/'):将字符串 weather 按照 斜杠 / 进行分割，返回一个 分割后的列表
-                ''' 
-                weather = "晴/多云/雨"
-                result = weather.split('/')
-                print(result)
-                
-                ['晴', '多云', '雨']
-                '''
-                temp = cols[2].get_text(strip=True)
-                temp_nums = re.findall(r'-?\d+', temp)
-                '''
-                re.findall() 的行为:会扫描整个字符串，找到所有符合模式的子串
-                    
-                    字符串: 5 ℃   /   - 2 ℃
-                           │      │    │
-                    匹配:  "5"   跳过  "-2" 
-                '''
-                #-? 表示可选负号，\d+ 匹配 1 个或多个数字
-                #re.findall():返回所有匹配的子字符串列表
-                if len(temp_nums) < 2:
-                    continue
-                high_temp, low_temp = temp_nums[0], temp_nums[1]
-
-                # 提取风力风向
-                wind = cols[3].get_text(strip=True)
-                day_wind, night_wind = wind.split('/') if '/' in wind else (wind, wind)
-
-                data.append({
-                    '日期': date,
-                    '白天天气': day_weather.strip(),
-                    '夜晚天气': night_weather.strip(),
-                    '最高温度': high_temp,
-                    '最低温度': low_temp,
-                    '白天风力': day_wind.strip(),
-                    '夜晚风力': night_wind.strip()
-                })
-
-            except Exception as e:
-                print(f"处理行时出错: {e}")
-                continue
-
-        return data
-
-    def scrape_month(self, month_link):
-        """爬取单个月份的天气数据"""
+    def fetch_month(self, month_link):
+        """只下载单个月份的页面，返回 (页面字节, 年月)；失败时返回None"""
         url = f"{self.base_url}{month_link}"
         print(f"正在爬取: {url}")
 
-        try:
-            response = self.session.get(url)
-            response.encoding = 'utf-8'
+        # 从URL中提取年月信息（如202201）
+        year_month = month_link.split('/')[-1].replace('.html', '')
+        '''
+            假设 month_link 是：
+            "/lishi/dalian/month/202201.html"
+            
+            split('/')
+            用斜杠 / 分割字符串，得到一个列表：
+            ['', 'lishi', 'dalian', 'month', '202201.html']
+            
+            [-1]
+            取列表的最后一项（即文件名部分）：
+            "202201.html"
+            
+            replace('.html', '')
+            去掉 .html 后缀，最终得到：
+            "202201"
+            '''
 
+        try:
+            if self.cache is not None:
+                # 已结束的月份有缓存时不发请求，当月页面做条件请求
+                response = self.cache.get(self.session, url, is_closed(year_month),
+                                          self.limiter, self.retry, self.concurrency, validate=has_weather_table)
+            else:
+                response = polite_get(self.session, url, self.limiter, self.retry, self.concurrency)
             if response.status_code != 200:
                 print(f"请求失败，状态码: {response.status_code}")
-                return []
+                return None
 
-            # 从URL中提取年月信息（如202201）
-            year_month = month_link.split('/')[-1].replace('.html', '')
-            '''
-                假设 month_link 是：
-                "/lishi/dalian/month/202201.html"
-                
-                split('/')
-                用斜杠 / 分割字符串，得到一个列表：
-                ['', 'lishi', 'dalian', 'month', '202201.html']
-                
-                [-1]
-                取列表的最后一项（即文件名部分）：
-                "202201.html"
-                
-                replace('.html', '')
-                去掉 .html 后缀，最终得到：
-                "202201"
-                '''
-
-            return self.parse_weather_table(response.text, year_month)
+            return response.content, year_month
 
         except Exception as e:
             print(f"爬取 {url} 时出错: {e}")
-            return []
+            return None
+
+    def scrape_month(self, month_link):
+        """爬取单个月份的天气数据"""
+        page = self.fetch_month(month_link)
+        return parse_page(*page) if page else []
+
+    def is_stored(self, month_link):
+        """该月份是否已在数据集中且已经结束（当月数据不完整，仍需重新爬取）"""
+        year_month = month_link.split('/')[-1].replace('.html', '')
+        return is_closed(year_month) and self.store.has_month(self.city, int(year_month[:4]), int(year_month[4:]))
 
     def scrape_all_data(self, start_year=2022, end_year=2024):
         """爬取所有月份的数据"""
         monthly_links = self.get_monthly_links(start_year, end_year)
+        # 已入库且已结束的月份不再爬取
+        monthly_links = [link for link in monthly_links if not self.is_stored(link)]
         all_data = []
 
-        # 使用线程池提高爬取速度
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            results = executor.map(self.scrape_month, monthly_links)
-            for result in results:
+        # 下载线程只取原始页面，解析交给进程池，不与下载线程争GIL；请求速率由限速器控制
+        if self.parse_workers != 0:
+            fetch = self.concurrency.limited(self.fetch_month) if self.concurrency else self.fetch_month
+            io_workers = self.concurrency.maximum if self.concurrency else self.max_workers
+            for month_link, records, error in fetch_parse_pipeline(
+                    fetch, monthly_links, parse_page, io_workers, self.parse_workers):
+                if error is not None:
+                    print(f"处理 {month_link} 时出错: {error}")
+                    continue
+                all_data.extend(records)
+        # 在下载线程中直接解析
+        elif self.concurrency is not None:
+            for result in self.concurrency.map(self.scrape_month, monthly_links):
                 all_data.extend(result)
                 #它和 append 方法不同，append 是添加整个对象作为单个元素，而 extend 是展开可迭代对象并合并元素。
-                time.sleep(1)  # 礼貌性延迟，避免被封
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for result in executor.map(self.scrape_month, monthly_links):
+                    all_data.extend(result)
 
         return all_data
 
-    def save_to_excel(self, data, filename="dalian_weather_2022-2024.xlsx"):
-        """将数据保存到Excel文件"""
-        if not data:
-            print("没有数据可保存")
-            return
-
-        df = pd.DataFrame(data)#使用pandas将Python字典列表转换为DataFrame
-
-        # 确保日期列存在
-        if '日期' not in df.columns:
-            print("数据中没有日期列")
-            return
+    def save_to_store(self, data, excel_filename=None, start=None, end=None):
+        """把新爬到的数据追加到分区数据集；给出excel_filename时再从数据集导出 start~end（'YYYYMM'）的Excel"""
+        if data:
+            df = pd.DataFrame(data)
+            months = self.store.append(df, self.city)
+            print(f"已写入 {months} 个月份分区（{self.store.root}）")
+        else:
+            print("没有新数据需要保存")
 
-        # 按日期排序
-        df['日期'] = pd.to_datetime(df['日期'], errors='coerce')
-        #原始数据中的日期可能是字符串类型，无法正确排序
-        df = df.dropna(subset=['日期'])#删除日期列中包含NaT（无效日期）的行
-        df = df.sort_values('日期')
+        if excel_filename:
+            self.store.export_excel(excel_filename, [self.city], start, end)
 
-        # 保存到Excel
-        df.to_excel(filename, index=False)
-        print(f"数据已保存到 {filename}")
-        print(f"共保存了 {len(df)} 条记录")
+    def close(self):
+        """关闭响应缓存和会话"""
+        if self.cache is not None:
+            self.cache.close()
+        self.session.close()
 
     def run(self):
-        """运行爬虫"""
+        """运行爬虫（结束时关闭缓存和会话）"""
+        try:
+            self._run()
+        finally:
+            self.close()
+
+    def _run(self):
+        """爬取并输出结果"""
         print("开始爬取大连2022-2024年天气数据...")
         weather_data = self.scrape_all_data()
-        print(f"共爬取到 {len(weather_data)} 条天气记录")
+        print(f"共爬取到 {len(weather_data)} 条新的天气记录")
 
-        if weather_data:
-            self.save_to_excel(weather_data)
-        else:
-            print("没有爬取到任何数据")
+        # 追加到分区数据集，再导出与原来相同的Excel文件
+        self.save_to_store(weather_data, "dalian_weather_2022-2024.xlsx", '202201', '202412')
 
 
 if __name__ == "__main__":
@@ -1,46 +1,23 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from weather_rollup import temperature_stats
+from weather_store import load_rollup
+
 # 基础设置
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
-# 数据加载与预处理
-df = pd.read_excel('dalian_weather_2022-2024.xlsx')
-df['日期'] = pd.to_datetime(df['日期'])
-df['月'] = df['日期'].dt.month
+# 数据加载：查询大连2022-2024年的逐月汇总（天数、和、平方和），不再扫描逐日数据
+monthly = load_rollup().monthly(['dalian'], '202201', '202412')
 
-# 温度数据处理
-df[['最高温度','最低温度']] = df[['最高温度','最低温度']].apply(pd.to_numeric, errors='coerce')
-#apply(pd.to_numeric)确保温度列是数值类型
-''' 
-1.apply 的作用:
-    apply 是 Pandas 中用于对 DataFrame 或 Series 的某一轴（行或列）应用函数的通用方法。它的常见用法：
-    对列操作：df.apply(func) 默认对每一列应用函数 func。
-    对行操作：df.apply(func, axis=1) 对每一行应用函数。
-2.apply(pd.to_numeric) 的用途
-当 DataFrame 中有多列需要转换为数值类型时，可以通过 apply(pd.to_numeric) 批量处理
-        import pandas as pd
-        # 示例DataFrame（包含字符串类型的数字）
-        df = pd.DataFrame({
-            "A": ["1", "2", "3"],
-            "B": ["4.1", "5.2", "6.3"]
-        })
-        # 将所有列转换为数值类型
-        df = df.apply(pd.to_numeric)
-        print(df.dtypes)
-        # 输出:
-        # A    int64
-        # B    float64
-'''
-# 计算月平均温度
-monthly_avg = df.groupby('月').agg(
-    平均最高温度=('最高温度', 'mean'),
-    最高温度标准差=('最高温度', 'std'),
-    平均最低温度=('最低温度', 'mean'),
-    最低温度标准差=('最低温度', 'std')
-).reset_index()
+# 按月份合并各年的汇总，得到月平均温度和标准差（与对逐日数据 groupby('月') 的结果相同）
+monthly_avg = temperature_stats(monthly, '月').rename(columns={
+    '最高温度_均值': '平均最高温度',
+    '最高温度_标准差': '最高温度标准差',
+    '最低温度_均值': '平均最低温度',
+    '最低温度_标准差': '最低温度标准差'
+})
 
 # 绘制温度变化图
 plt.figure(figsize=(12,6))
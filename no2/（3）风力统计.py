@@ -1,64 +1,22 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import re
 from matplotlib.ticker import MaxNLocator
 
+from weather_rollup import WIND_COLUMNS
+from weather_store import load_rollup
+from wind import WIND_LEVELS
+
 plt.rcParams['font.sans-serif'] = ['SimHei']  # 指定默认字体为黑体
 plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 
-# 加载数据
-df = pd.read_excel('dalian_weather_2022-2024.xlsx')
-
-# 转换日期列为datetime格式
-df['日期'] = pd.to_datetime(df['日期'])
-df['年份'] = df['日期'].dt.year
-df['月份'] = df['日期'].dt.month
-
 # 定义风力等级分类
-wind_levels = ['1-2级', '3-4级', '4-5级', '5-6级', '6-7级', '>7级']
+wind_levels = WIND_LEVELS
 colors = ['#66b3ff', '#ff9999', '#99ff99', '#ffcc99', '#cc99ff', '#ff6666']
 
-
-def classify_wind(wind_str):
-    if pd.isna(wind_str):
-        return '1-2级'  # 将缺失值归类为1-2级
-
-    if '无持续风向' in wind_str:
-        return '1-2级'  # 将无持续风向归类为1-2级
-
-    # 提取数字部分
-    match = re.search(r'(\d+)-(\d+)级', wind_str)
-    if not match:
-        match = re.search(r'(\d+)级', wind_str)
-        if match:
-            wind_num = int(match.group(1))
-        else:
-            return '1-2级'
-    else:
-        wind_num = int(match.group(2))  # 取较高的风力值
-
-    # 分类
-    if wind_num <= 2:
-        return '1-2级'
-    elif wind_num <= 4:
-        return '3-4级'
-    elif wind_num == 5:
-        return '4-5级'
-    elif wind_num == 6:
-        return '5-6级'
-    elif wind_num == 7:
-        return '6-7级'
-    else:
-        return '>7级'
-
-
-# 应用分类函数
-df['风力分类'] = df['白天风力'].apply(classify_wind)
-
-# 按年月统计各风力等级天数
-wind_monthly = df.groupby(['年份', '月份', '风力分类']).size().unstack(fill_value=0)
-wind_monthly = wind_monthly.reindex(columns=wind_levels, fill_value=0)
+# 查询逐月汇总中各风力等级的天数（入库时已按白天风力分级，规则见 wind.classify_levels）
+monthly = load_rollup().monthly(['dalian'], '202201', '202412')
+wind_monthly = monthly.set_index(['年', '月'])[WIND_COLUMNS]
+wind_monthly.columns = wind_levels
 
 # 创建月份标签
 month_labels = [f'{y}年{m}月' for y, m in wind_monthly.index]
@@ -1,21 +1,26 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 
+from weather_store import load_rollup
+from weather_vocab import transition_pairs
+
 # 设置中文显示
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
-# 读取并处理数据
-df = pd.read_excel('dalian_weather_2022-2024.xlsx')
-df['白天天气'] = df['白天天气'].str.replace('转.*', '', regex=True)
-df['夜晚天气'] = df['夜晚天气'].str.replace('转.*', '', regex=True)
-# 使用正则表达式处理天气数据，将"转"字后面的内容去除（如"晴转多云"变为"晴"）
-# 对白天和夜晚天气列都进行相同处理
-# 统计天气频次
-weather_data = pd.concat([
-    df['白天天气'].value_counts().rename('白天'),
-    df['夜晚天气'].value_counts().rename('夜晚')
-], axis=1).fillna(0)
+# 查询逐月汇总中的天气类型天数（入库时已按固定词表编码，"晴转多云"的 天气 记为"晴"、转为 记为"多云"）
+counts = load_rollup().weather_counts(['dalian'], '202201', '202412')
+# 统计天气频次：白天、夜晚各一列（天气 是分类列，按编码分组，只保留出现过的类型）
+weather_data = counts.pivot_table(index='天气', columns='时段', values='天数', aggfunc='sum', fill_value=0,
+                                  observed=True)
+weather_data = weather_data.reindex(columns=['白天', '夜晚'], fill_value=0)
+
+# 天气转变（"晴转多云" 中的 晴→多云）作为单独的特征统计，白天、夜晚合计
+transitions = transition_pairs(counts['天气'], counts['转为'], counts['天数'])
+if transitions.empty:
+    print("这段时间的数据中没有天气转变的写法")
+else:
+    print("最常见的天气转变（前10种）：")
+    print(transitions.nlargest(10).to_string())
 
 # 取前10种常见天气
 top_weather = weather_data.sum(axis=1).nlargest(10).index
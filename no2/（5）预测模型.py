@@ -1,46 +1,25 @@
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from xgboost import XGBRegressor
+
+from forecast import ForecastEngine, add_features, build_series
+from weather_store import load_rollup
 
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
-# 读取数据
-df = pd.read_excel('dalian_weather_2022-2024+2025.1-6.xlsx')
-
-# 转换日期并提取年月
-df['日期'] = pd.to_datetime(df['日期'])
-df['年'] = df['日期'].dt.year
-df['月'] = df['日期'].dt.month
-
-# 计算每月平均温度
-monthly_temp = df.groupby(['年', '月']).agg({'最高温度': 'mean'}).reset_index()
-
-# 添加时间序号 + 月份特征（让模型知道季节变化）
-monthly_temp['时间序号'] = (monthly_temp['年'] - 2022) * 12 + monthly_temp['月']
-monthly_temp['月份_sin'] = np.sin(2 * np.pi * monthly_temp['月'] / 12)  # 用sin/cos捕捉周期性
-monthly_temp['月份_cos'] = np.cos(2 * np.pi * monthly_temp['月'] / 12)
-
-# 训练数据（2022-2024）
-train_data = monthly_temp[monthly_temp['年'] < 2025].copy()
-X_train = train_data[['时间序号', '月份_sin', '月份_cos']]  # 加入月份特征
-y_train = train_data['最高温度']
-
-# 测试数据（2025年1-6月）
-test_data = monthly_temp[(monthly_temp['年'] == 2025) & (monthly_temp['月'] <= 6)].copy()
-X_test = test_data[['时间序号', '月份_sin', '月份_cos']]
-y_test = test_data['最高温度']
+# 读取逐月汇总，展开为序列长表：每月平均最高温度 = 最高温度之和 / 天数
+monthly = load_rollup().monthly(['dalian'], '202201', '202506')
+series = build_series(monthly, targets=['最高温度'])
 
-# 训练XGBoost模型（比多项式回归更适合时间序列）
-model = XGBRegressor(n_estimators=100, learning_rate=0.1, random_state=42)
-model.fit(X_train, y_train)
+# 用2022-2024年训练，预测2025年1-6月（特征：时间序号 + 月份sin/cos，让模型知道季节变化）
+# 预测引擎按数据版本缓存模型，数据没有变化时直接读取已训练的模型
+engine = ForecastEngine()
+result = engine.forecast(series, train_end='202412', horizon=6)
 
-# 预测
-test_data.loc[:, '预测温度'] = model.predict(X_test)
+train_data = add_features(series[series['年'] < 2025]).rename(columns={'值': '最高温度'})
+test_data = add_features(result).rename(columns={'值': '最高温度', '预测': '预测温度'})
 
 # 计算MSE
-# mse = mean_squared_error(y_test, test_data['预测温度'])
+# mse = mean_squared_error(test_data['最高温度'], test_data['预测温度'])
 # print(f"模型在测试集上的均方误差(MSE): {mse:.2f}")
 
 # 绘制结果
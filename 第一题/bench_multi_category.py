@@ -0,0 +1,82 @@
+"""行业拆分统计基准：原 iterrows 循环 vs multi_category 向量化实现
+
+用法：python bench_multi_category.py [行数]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from multi_category import category_stats, explode_categories, incidence_matrix
+
+INDUSTRIES = ['房地产', '饮料', '医疗保健', '社交媒体', '电子商务', '汽车', '锂电池',
+              '半导体', '化工', '投资', '食品', '物流', '游戏', '家电', '金融服务']
+
+
+def make_rows(n, seed=0):
+    """生成n行随机榜单数据，每人1-3个行业"""
+    rng = np.random.default_rng(seed)
+    one = pd.Series(rng.choice(INDUSTRIES, n))
+    two = one + '、' + rng.choice(INDUSTRIES, n)
+    three = two + '、' + rng.choice(INDUSTRIES, n)
+    k = rng.integers(1, 4, n)
+    industries = np.select([k == 1, k == 2], [one, two], three)
+    return pd.DataFrame({
+        '全名_中文': ['富豪{}'.format(i) for i in range(n)],
+        '公司总部地_中文': rng.choice(['北京', '上海', '深圳', '杭州'], n),
+        '所在行业_中文': industries,
+        '财富值_人民币_亿': rng.lognormal(4, 1, n).round(1),
+    })
+
+
+def legacy_stats(df):
+    """paqu.py 中原来的写法"""
+    df = df.copy()
+    df['行业'] = df['所在行业_中文'].str.split('、')
+    rows = []
+    for _, row in df.iterrows():
+        for industry in row['行业']:
+            rows.append({
+                '富豪姓名': row['全名_中文'],
+                '公司总部地': row['公司总部地_中文'],
+                '财富值': row['财富值_人民币_亿'],
+                '行业': industry
+            })
+    expanded = pd.DataFrame(rows)
+    return pd.concat([
+        expanded['行业'].value_counts(),
+        expanded.groupby('行业')['财富值'].sum().rename('财富总和(亿)'),
+        expanded.groupby('行业')['财富值'].mean().rename('平均财富(亿)'),
+        expanded.groupby('行业')['财富值'].median().rename('财富中位数(亿)'),
+    ], axis=1)
+
+
+def vectorized_stats(df):
+    return category_stats(explode_categories(df, '所在行业_中文'))
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = make_rows(n)
+
+    old, old_time = timeit(legacy_stats, df)
+    new, new_time = timeit(vectorized_stats, df)
+    (_, labels), matrix_time = timeit(incidence_matrix, df, '所在行业_中文')
+
+    # 两种实现结果应一致
+    aligned = old.loc[new.index]
+    assert (aligned.iloc[:, 0].to_numpy() == new['富豪数量'].to_numpy()).all()
+    assert np.allclose(aligned['财富总和(亿)'], new['财富总和(亿)'])
+    assert np.allclose(aligned['财富中位数(亿)'], new['财富中位数(亿)'])
+
+    print('行数: {}，拆分后行业数: {}'.format(n, len(labels)))
+    print('iterrows 循环:   {:.3f}s'.format(old_time))
+    print('向量化 explode:  {:.3f}s（快 {:.0f} 倍）'.format(new_time, old_time / new_time))
+    print('稀疏关联矩阵:    {:.3f}s'.format(matrix_time))
@@ -0,0 +1,64 @@
+"""分析入口冷启动基准：用 python -X importtime 统计 `hutu.py stats` 的导入耗时
+
+用法：python bench_startup.py [--budget-ms 毫秒] [--top N]
+
+超出预算，或 stats 路径上导入了绘图库时返回非零退出码，方便发现启动回归。
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'pyecharts')
+# import time: self [us] | cumulative | imported package
+LINE_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| ( *)(\S+)')
+
+
+def run_importtime(args):
+    """运行一次入口脚本，返回 (墙钟秒数, [(累计微秒, 缩进层级, 模块名), ...])"""
+    cmd = [sys.executable, '-X', 'importtime', os.path.join(HERE, 'hutu.py')] + args
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=HERE, capture_output=True, text=True, encoding='utf-8')
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+
+    records = []
+    for line in proc.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            records.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return elapsed, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=1500, help='导入总耗时上限（毫秒）')
+    parser.add_argument('--top', type=int, default=10, help='显示最慢的前N个顶层导入')
+    args = parser.parse_args()
+
+    elapsed, records = run_importtime(['stats'])
+    top_level = [(us, name) for us, depth, name in records if depth == 0]
+    total_ms = sum(us for us, _ in top_level) / 1000
+    heavy = sorted({name.split('.')[0] for _, _, name in records if name.split('.')[0] in HEAVY_MODULES})
+
+    print(f"hutu.py stats 墙钟时间: {elapsed * 1000:.0f}ms，导入耗时: {total_ms:.0f}ms（预算 {args.budget_ms:.0f}ms）")
+    print(f"最慢的 {args.top} 个顶层导入:")
+    for us, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if heavy:
+        print(f"回归：stats 路径导入了绘图库 {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("回归：导入耗时超出预算")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""胡润百富榜静态图表的无界面批量渲染
+
+每张图先在主进程里提取出它需要的那一小块数据（图表规格），再交给进程池并行绘制。
+以数据内容哈希作为缓存键，数据没变的图表在重复运行时直接跳过。
+"""
+import hashlib
+import json
+import os
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use('Agg')  # 无界面后端，不弹窗、不阻塞
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from scatter_lod import plan_scatter
+
+DPI = 300
+CACHE_FILE = '.chart_cache.json'
+
+# kind: 绘图函数名；filename: 输出文件；data: 绘图所需数据（Series或DataFrame）
+ChartSpec = namedtuple('ChartSpec', ['kind', 'filename', 'data'])
+
+
+def setup_style():
+    """设置全局样式（每个绘图进程各自调用一次）"""
+    warnings.filterwarnings('ignore')
+    plt.style.use('ggplot')
+    sns.set_style("whitegrid", {'grid.linestyle': '--', 'grid.alpha': 0.3})
+    matplotlib.rcParams['font.family'] = 'SimHei'  # 设置中文字体
+    matplotlib.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
+
+
+# 1. 年龄分布分析 - 柱状图
+def age_histogram(age_data, path):
+    plt.figure(figsize=(14, 8))
+    bins = range(20, 101, 5)  # 每5岁一个区间
+    counts, bins, patches = plt.hist(age_data, bins=bins, color='#4B9AC0', edgecolor='white', alpha=0.85)
+
+    # 添加数据标签
+    for i in range(len(patches)):
+        if counts[i] > 0:  # 只显示有数据的柱子
+            plt.text(patches[i].get_x() + patches[i].get_width() / 2,
+                     patches[i].get_height() + 0.5,
+                     int(counts[i]),
+                     ha='center',
+                     fontsize=10)
+
+    plt.title('2024胡润百富榜富豪年龄分布', fontsize=18, pad=20)
+    plt.xlabel('年龄区间', fontsize=14)
+    plt.ylabel('人数', fontsize=14)
+    plt.xticks(bins, [f"{i}-{i + 4}岁" for i in bins[:-1]] + ['95+岁'])
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 2. 性别分布分析 - 饼图
+def gender_pie(gender_counts, path):
+    plt.figure(figsize=(10, 10))
+    n = len(gender_counts)
+    colors = ['#3498db', '#e74c3c', '#95a5a6'][:n]  # 男、女、未知
+    explode = (0.05, 0.05, 0)[:n]  # 突出前两个
+
+    wedges, texts, autotexts = plt.pie(
+        gender_counts.values,
+        labels=gender_counts.index,
+        autopct='%1.1f%%',
+        colors=colors,
+        startangle=90,
+        explode=explode,
+        shadow=True,
+        wedgeprops={'edgecolor': 'white', 'linewidth': 1.5},
+        textprops={'fontsize': 13}
+    )
+
+    # 设置字体大小和颜色
+    plt.setp(autotexts, size=14, weight="bold", color='white')
+    plt.title('2024胡润百富榜性别分布', fontsize=18, pad=20)
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 3. 出生地分布分析 - 柱状图
+def province_bar(province_counts, path):
+    plt.figure(figsize=(16, 12))
+
+    # 创建水平条形图
+    ax = sns.barplot(
+        x=province_counts.values,
+        y=province_counts.index,
+        palette='Blues_r',  # 从深到浅的蓝色
+        orient='h'
+    )
+
+    # 添加数据标签
+    for i, v in enumerate(province_counts.values):
+        ax.text(v + 0.5, i, f"{v}", color='black', va='center', fontsize=12)
+
+    plt.title('2024胡润百富榜富豪出生地分布（TOP15省份）', fontsize=20, pad=20)
+    plt.xlabel('人数', fontsize=16)
+    plt.ylabel('省份', fontsize=16)
+    plt.grid(axis='x', alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 4. 年龄与财富关系分析
+def age_wealth_scatter(df, path):
+    plt.figure(figsize=(16, 10))
+
+    # 创建自定义调色板
+    palette = {
+        '男': '#3498db',
+        '女': '#e74c3c',
+        '未知': '#95a5a6'
+    }
+
+    # 创建散点图
+    sns.scatterplot(
+        data=df,
+        x='年龄',
+        y='财富值_人民币_亿',
+        hue='性别',
+        palette=palette,
+        size='财富值_人民币_亿',
+        sizes=(30, 600),
+        alpha=0.75,
+        edgecolor='w',
+        linewidth=0.8
+    )
+
+    title = '富豪年龄与财富分布'
+    if df.attrs.get('total', len(df)) > len(df):
+        title += f"（抽样 {len(df)}/{df.attrs['total']}）"
+    plt.title(title, fontsize=20, pad=20)
+    plt.xlabel('年龄', fontsize=16)
+    plt.ylabel('财富值(亿人民币)', fontsize=16)
+    plt.grid(alpha=0.2)
+
+    # 添加平均线（抽样时均值仍按全部数据计算）
+    mean_age = df.attrs.get('mean_age', df['年龄'].mean())
+    mean_wealth = df.attrs.get('mean_wealth', df['财富值_人民币_亿'].mean())
+    plt.axvline(mean_age, color='#e74c3c', linestyle='--', alpha=0.7)
+    plt.axhline(mean_wealth, color='#3498db', linestyle='--', alpha=0.7)
+    plt.text(mean_age + 1, max(df['财富值_人民币_亿'].dropna()) * 0.9, f'平均年龄: {mean_age:.1f}岁',
+             fontsize=14, color='#e74c3c')
+    plt.text(min(df['年龄'].dropna()) + 5, mean_wealth + 100, f'平均财富: {mean_wealth:.1f}亿',
+             fontsize=14, color='#3498db')
+
+    plt.legend(title='性别', loc='upper right', fontsize=12, title_fontsize=14)
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 4. 年龄与财富关系分析 - 数据量大时改用二维直方图
+def age_wealth_density(grid, path):
+    plt.figure(figsize=(16, 10))
+    x_edges = np.unique(np.concatenate([grid['年龄_左'], grid['年龄_右']]))
+    y_edges = np.unique(np.concatenate([grid['财富_下'], grid['财富_上']]))
+    counts = grid['人数'].to_numpy().reshape(len(x_edges) - 1, len(y_edges) - 1)
+    # 人数为0的格子留白
+    mesh = plt.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap='Blues', shading='flat')
+    plt.colorbar(mesh, label='人数')
+    plt.yscale('log')
+
+    plt.title(f"富豪年龄与财富分布（{grid.attrs.get('total', int(counts.sum()))}人）", fontsize=20, pad=20)
+    plt.xlabel('年龄', fontsize=16)
+    plt.ylabel('财富值(亿人民币)', fontsize=16)
+    plt.axvline(grid.attrs['mean_age'], color='#e74c3c', linestyle='--', alpha=0.7)
+    plt.axhline(grid.attrs['mean_wealth'], color='#3498db', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 5. 行业分布分析（前15名）
+def industry_bar(industry_counts, path):
+    plt.figure(figsize=(16, 12))
+
+    # 使用水平条形图
+    ax = sns.barplot(
+        x=industry_counts.values,
+        y=industry_counts.index,
+        hue=industry_counts.index,  # 修复警告
+        palette='viridis',
+        legend=False
+    )
+
+    plt.title('富豪所在行业分布(TOP15)', fontsize=20, pad=20)
+    plt.xlabel('人数', fontsize=16)
+    plt.ylabel('行业', fontsize=16)
+
+    # 添加数据标签
+    for i, v in enumerate(industry_counts.values):
+        ax.text(v + 0.5, i, f"{v}", color='black', va='center', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+# 6. 财富分布分析
+def wealth_bar(wealth_counts, path):
+    plt.figure(figsize=(16, 10))
+
+    # 创建条形图
+    ax = sns.barplot(
+        x=wealth_counts.index,
+        y=wealth_counts.values,
+        hue=wealth_counts.index,  # 修复警告
+        palette='rocket',
+        legend=False
+    )
+
+    plt.title('2024胡润百富榜财富分布', fontsize=20, pad=20)
+    plt.xlabel('财富区间(人民币)', fontsize=16)
+    plt.ylabel('人数', fontsize=16)
+    plt.xticks(rotation=15)
+
+    # 在每个柱子上方添加数值标签
+    for i, v in enumerate(wealth_counts.values):
+        ax.text(i, v + 0.5, f"{v}", ha='center', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+
+
+RENDERERS = {
+    'age_histogram': age_histogram,
+    'gender_pie': gender_pie,
+    'province_bar': province_bar,
+    'age_wealth_scatter': age_wealth_scatter,
+    'age_wealth_density': age_wealth_density,
+    'industry_bar': industry_bar,
+    'wealth_bar': wealth_bar,
+}
+
+
+def _value_counts(series):
+    """按普通值计数：分类列直接value_counts会带上未出现的类别，seaborn会把它们全部画出来"""
+    return series.astype(object).value_counts()
+
+
+def build_specs(df, lod_mode='sample'):
+    """从清洗后的数据中提取每张图所需的数据
+
+    lod_mode: 散点图行数超过阈值时的降级方式，'sample' 分层抽样或 'density' 二维直方图
+    """
+    scatter_kind, scatter_data = plan_scatter(df.astype({'性别': object}), mode=lod_mode)
+    # 创建财富区间
+    bins = [0, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+    labels = ['<50亿', '50-100亿', '100-200亿', '200-500亿', '500-1000亿', '1000-2000亿', '2000-5000亿', '>5000亿']
+    wealth_cut = pd.cut(df['财富值_人民币_亿'].dropna(), bins=bins, labels=labels, right=False)
+
+    return [
+        ChartSpec('age_histogram', '富豪年龄分布.png', df['年龄'].dropna()),
+        ChartSpec('gender_pie', '富豪性别分布.png', _value_counts(df['性别'])),
+        ChartSpec('province_bar', '出生地分布柱状图.png',
+                  _value_counts(df['省份']).head(15).sort_values(ascending=True)),
+        ChartSpec(scatter_kind, '年龄与财富分布.png', scatter_data),
+        ChartSpec('industry_bar', '行业分布.png', _value_counts(df['所在行业_中文']).head(15)),
+        ChartSpec('wealth_bar', '财富分布.png', wealth_cut.value_counts().sort_index()),
+    ]
+
+
+def spec_digest(spec):
+    """图表类型 + 数据内容（含索引）的哈希"""
+    digest = hashlib.sha1(spec.kind.encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(spec.data, index=True).to_numpy().tobytes())
+    if isinstance(spec.data, pd.DataFrame):
+        digest.update(','.join(map(str, spec.data.columns)).encode('utf-8'))
+    digest.update(repr(sorted(spec.data.attrs.items())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _render(kind, data, path):
+    """在绘图进程中渲染一张图"""
+    RENDERERS[kind](data, path)
+    plt.close('all')
+    return path
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_all(df, out_dir='.', workers=None, force=False, lod_mode='sample'):
+    """并行渲染全部图表，返回本次实际重新绘制的文件列表"""
+    cache_path = os.path.join(out_dir, CACHE_FILE)
+    cache = {} if force else _load_cache(cache_path)
+
+    jobs = {}
+    for spec in build_specs(df, lod_mode):
+        path = os.path.join(out_dir, spec.filename)
+        digest = spec_digest(spec)
+        if cache.get(spec.filename) == digest and os.path.exists(path):
+            print(f"{spec.filename} 数据未变化，跳过")
+            continue
+        jobs[spec.filename] = (spec, path, digest)
+
+    rendered = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_style) as pool:
+            futures = {pool.submit(_render, spec.kind, spec.data, path): name
+                       for name, (spec, path, digest) in jobs.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                rendered.append(future.result())
+                cache[name] = jobs[name][2]
+                print(f"已生成 {name}")
+
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    return rendered
@@ -0,0 +1,121 @@
+"""榜单清洗阶段：CSV -> 带类型的Feather快照
+
+清洗一次后写出 Arrow/Feather 快照（分类列为字典编码），源CSV的修改时间或内容哈希
+不变时，之后的分析直接内存映射读取快照，不再重新解析文本、重新清洗。
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from region_resolver import resolve_regions
+
+# 清洗逻辑变化时递增，使旧快照失效
+CLEAN_VERSION = 1
+CATEGORY_COLUMNS = ['性别', '省份', '城市', '出生地_中文', '出生地_英文', '公司总部地_中文', '公司总部地_英文',
+                    '所在行业_中文', '所在行业_英文', '组织结构']
+
+
+def clean_wealth_value(series):
+    """清洗财富值列：移除逗号、货币符号等非数字字符（保留小数点），转换失败为NaN"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    cleaned = series.astype('string').str.replace(r'[^\d.]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+
+# 数据清洗函数
+def clean_data(df):
+    """清洗数据，处理异常值"""
+    # 1. 性别数据清洗
+    gender_mapping = {
+        '先生': '男',
+        '女士': '女',
+        '男性': '男',
+        '女性': '女'
+    }
+    df['性别'] = df['性别'].replace(gender_mapping)
+    df['性别'] = df['性别'].fillna('未知')
+
+    # 2. 年龄数据清洗 - 将非数值转换为NaN
+    df['年龄'] = pd.to_numeric(df['年龄'], errors='coerce')
+
+    # 3. 财富数据清洗 - 将非数值转换为NaN
+    df['财富值_人民币_亿'] = clean_wealth_value(df['财富值_人民币_亿'])
+
+    # 4. 出生地数据清洗：解析省份和城市（按不同地址去重后匹配）
+    regions = resolve_regions(df['出生地_中文'])
+    df['省份'] = regions['省份']
+    df['城市'] = regions['城市']
+
+    # 5. 重复值多的文本列转为分类类型
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    return df
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.clean.feather'
+
+
+def _meta_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.clean.json'
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot_valid(csv_path):
+    """快照是否仍对应当前的源CSV：先比较修改时间和大小，不同时再比较内容哈希"""
+    try:
+        with open(_meta_path(csv_path), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if meta.get('version') != CLEAN_VERSION or not os.path.exists(snapshot_path(csv_path)):
+        return False
+
+    stat = os.stat(csv_path)
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True
+    if meta['sha1'] != _file_sha1(csv_path):
+        return False
+    # 内容未变，只是被touch过：更新记录的修改时间
+    _write_meta(csv_path, meta['sha1'])
+    return True
+
+
+def _write_meta(csv_path, sha1):
+    stat = os.stat(csv_path)
+    meta = {'version': CLEAN_VERSION, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': sha1}
+    with open(_meta_path(csv_path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def build_snapshot(csv_path):
+    """读取并清洗CSV，写出不压缩的Feather快照（便于内存映射），返回清洗后的DataFrame"""
+    df = clean_data(pd.read_csv(csv_path))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, snapshot_path(csv_path), compression='uncompressed')
+    _write_meta(csv_path, _file_sha1(csv_path))
+    return df
+
+
+def load_clean(csv_path='2024胡润百富榜.csv', columns=None):
+    """读取清洗后的数据：快照有效时内存映射读取，否则重新清洗并生成快照"""
+    if not _snapshot_valid(csv_path):
+        print(f"{csv_path} 有变化，重新清洗并生成快照")
+        df = build_snapshot(csv_path)
+        return df[columns] if columns else df
+    table = feather.read_table(snapshot_path(csv_path), columns=columns, memory_map=True)
+    return table.to_pandas()
@@ -0,0 +1,182 @@
+"""出生地热力图（pyecharts）
+
+render_heatmap  单张图，pyecharts 默认的自包含HTML
+render_slim     多张图合成一页：echarts脚本和中国地图引用本地共享的 assets 目录，
+                每张图的数据单独存为紧凑的JS数据文件，切换标签页时才加载
+"""
+import html
+import json
+import os
+import urllib.request
+
+from pyecharts import options as opts
+from pyecharts.charts import Geo
+from pyecharts.globals import ChartType, CurrentConfig
+
+DEFAULT_TITLE = "2024胡润百富榜出生地分布热力图"
+# 需要的共享资源（相对 assets 目录的路径）
+ASSET_FILES = ['echarts.min.js', 'maps/china.js']
+
+
+def region_counts(df, level='省份'):
+    """按省份/城市统计人数（普通值计数，不含未出现的类别）"""
+    return df[level].astype(object).value_counts()
+
+
+def build_geo(counts, title=DEFAULT_TITLE):
+    """根据 {地名: 人数} 构建地理热力图"""
+    geo = Geo(init_opts=opts.InitOpts(width='1200px', height='900px', theme='light'))
+    return (
+        geo
+        .add_schema(
+            maptype="china",
+            itemstyle_opts=opts.ItemStyleOpts(color="#f7f7f7", border_color="#111")
+        )
+        .add(
+            series_name="富豪数量",
+            # 跳过pyecharts没有坐标的地名，避免城市粒度时报错
+            data_pair=[(prov, int(count)) for prov, count in counts.items() if geo.get_coordinate(prov)],
+            type_=ChartType.HEATMAP,
+            label_opts=opts.LabelOpts(is_show=False),
+        )
+        .set_series_opts(
+            label_opts=opts.LabelOpts(font_size=12, color="rgba(0,0,0,0.7)")
+        )
+        .set_global_opts(
+            title_opts=opts.TitleOpts(
+                title=title,
+                subtitle="数据来源：胡润百富榜",
+                title_textstyle_opts=opts.TextStyleOpts(font_size=22),
+                subtitle_textstyle_opts=opts.TextStyleOpts(font_size=16)
+            ),
+            visualmap_opts=opts.VisualMapOpts(
+                min_=0,
+                max_=int(counts.max()) if len(counts) else 0,
+                is_calculable=True,
+                orient="horizontal",
+                pos_left="center",
+                pos_bottom="50px",
+                range_color=["#E0ECFF", "#1E90FF", "#0066CC"]
+            ),
+            tooltip_opts=opts.TooltipOpts(
+                formatter="{b}: {c}位富豪",
+                background_color="rgba(0,0,0,0.7)",
+                border_color="#333",
+                textstyle_opts=opts.TextStyleOpts(color="#fff")
+            ),
+            legend_opts=opts.LegendOpts(is_show=False)
+        )
+    )
+
+
+def render_heatmap(df, level='省份', path="出生地分布热力图.html"):
+    """level: 热力图粒度，'省份' 或更细的 '城市'"""
+    geo = build_geo(region_counts(df, level))
+
+    # 保存为HTML文件
+    geo.render(path)
+    print(f"热力图已保存为'{path}'")
+
+
+def ensure_assets(assets_dir='assets'):
+    """本地没有共享资源时从 pyecharts 资源站下载一次，之后所有页面共用"""
+    for name in ASSET_FILES:
+        path = os.path.join(assets_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            print(f"下载 {name} 到 {assets_dir}")
+            urllib.request.urlretrieve(CurrentConfig.ONLINE_HOST + name, path)
+
+
+def slim_options(geo):
+    """图表配置序列化为不带缩进的紧凑JSON"""
+    return json.dumps(json.loads(geo.dump_options()), ensure_ascii=False, separators=(',', ':'))
+
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{scripts}
+<style>
+#tabs button {{ margin: 4px; padding: 6px 14px; border: 1px solid #ccc; background: #fff; cursor: pointer; }}
+#tabs button.active {{ background: #1E90FF; color: #fff; }}
+</style>
+</head>
+<body>
+<div id="tabs">{buttons}</div>
+<div id="chart" style="width:1200px;height:900px;"></div>
+<script>
+var chart = echarts.init(document.getElementById('chart'), 'light');
+var loaded = {{}};
+var current = null;
+// 数据文件加载完成后调用
+window.heatmapData = function (key, option) {{
+    loaded[key] = option;
+    if (key === current) chart.setOption(option, true);
+}};
+function show(key) {{
+    current = key;
+    document.querySelectorAll('#tabs button').forEach(function (b) {{
+        b.classList.toggle('active', b.dataset.key === key);
+    }});
+    if (loaded[key]) {{ chart.setOption(loaded[key], true); return; }}
+    // 首次切换到该标签时才加载对应的数据文件（用script标签加载，直接打开本地文件也可用）
+    var script = document.createElement('script');
+    script.src = '{data_dir}/' + key + '.js';
+    document.head.appendChild(script);
+}}
+document.querySelectorAll('#tabs button').forEach(function (b) {{
+    b.onclick = function () {{ show(b.dataset.key); }};
+}});
+show('{first}');
+</script>
+</body>
+</html>
+'''
+
+
+def render_slim(pages, path='出生地分布热力图_多页.html', assets_dir='assets', title=DEFAULT_TITLE):
+    """把多张热力图写成一个带标签页的页面
+
+    pages: [(标签名, {地名: 人数}), ...]。页面只引用共享资源，每张图的数据
+    存为 <页面名>_data/tabN.js，返回写出的总字节数（不含共享资源）。
+    """
+    ensure_assets(assets_dir)
+    out_dir = os.path.dirname(os.path.abspath(path))
+    data_name = os.path.splitext(os.path.basename(path))[0] + '_data'
+    os.makedirs(os.path.join(out_dir, data_name), exist_ok=True)
+
+    total = 0
+    buttons = []
+    for i, (label, counts) in enumerate(pages):
+        key = f'tab{i}'
+        payload = f'heatmapData({json.dumps(key)},{slim_options(build_geo(counts, f"{title}（{label}）"))});'
+        with open(os.path.join(out_dir, data_name, key + '.js'), 'w', encoding='utf-8') as f:
+            total += f.write(payload)
+        buttons.append(f'<button data-key="{key}">{html.escape(label)}</button>')
+
+    assets_rel = os.path.relpath(os.path.abspath(assets_dir), out_dir).replace(os.sep, '/')
+    scripts = '\n'.join(f'<script src="{assets_rel}/{name}"></script>' for name in ASSET_FILES)
+    page = PAGE_TEMPLATE.format(title=title, scripts=scripts, buttons=''.join(buttons),
+                                data_dir=data_name, first='tab0')
+    with open(path, 'w', encoding='utf-8') as f:
+        total += f.write(page)
+    print(f"热力图页面已保存为'{path}'，共{len(pages)}张图")
+    return total
+
+
+def build_pages(df, level='省份', by=None, top=20):
+    """按分组列（如 '年份'、'性别'、'行业'）拆成多张热力图，第一页为全部数据，分组最多取人数前top个"""
+    pages = [('全部', region_counts(df, level))]
+    if by is None:
+        return pages
+    if by == '行业':
+        from multi_category import explode_categories
+
+        df = explode_categories(df, '所在行业_中文', name='行业')
+    groups = df[by].astype(object).value_counts().index[:top]
+    for value in groups:
+        pages.append((str(value), region_counts(df[df[by] == value], level)))
+    return pages
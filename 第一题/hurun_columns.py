@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+# 输出列定义：(列名, JSON路径, 类型)
+# 类型：str 原样保存；category 分类列；float 浮点；int 可空整数
+SCHEMA = [
+    ('排名', ('hs_Rank_Rich_Ranking',), 'int'),
+    ('排名变化', ('hs_Rank_Rich_Ranking_Change',), 'str'),
+    ('全名_中文', ('hs_Character', 0, 'hs_Character_Fullname_Cn'), 'str'),
+    ('全名_英文', ('hs_Character', 0, 'hs_Character_Fullname_En'), 'str'),
+    ('年龄', ('hs_Character', 0, 'hs_Character_Age'), 'str'),
+    ('出生地_中文', ('hs_Character', 0, 'hs_Character_BirthPlace_Cn'), 'category'),
+    ('出生地_英文', ('hs_Character', 0, 'hs_Character_BirthPlace_En'), 'category'),
+    ('性别', ('hs_Character', 0, 'hs_Character_Gender'), 'category'),
+    ('照片', ('hs_Character', 0, 'hs_Character_Photo'), 'str'),
+    ('公司名称_中文', ('hs_Rank_Rich_ComName_Cn',), 'str'),
+    ('公司名称_英文', ('hs_Rank_Rich_ComName_En',), 'str'),
+    ('公司总部地_中文', ('hs_Rank_Rich_ComHeadquarters_Cn',), 'category'),
+    ('公司总部地_英文', ('hs_Rank_Rich_ComHeadquarters_En',), 'category'),
+    ('所在行业_中文', ('hs_Rank_Rich_Industry_Cn',), 'category'),
+    ('所在行业_英文', ('hs_Rank_Rich_Industry_En',), 'category'),
+    ('组织结构', ('hs_Rank_Rich_Relations',), 'str'),
+    ('财富值_人民币_亿', ('hs_Rank_Rich_Wealth',), 'float'),
+    ('财富值变化', ('hs_Rank_Rich_Wealth_Change',), 'str'),
+    ('财富值_美元', ('hs_Rank_Rich_Wealth_USD',), 'float'),
+    ('年份', ('hs_Rank_Rich_Year',), 'int'),
+]
+
+
+def _make_getter(path):
+    """按JSON路径取值，路径缺失时返回None"""
+
+    def get(item):
+        value = item
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return value
+
+    return get
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_text(value):
+    return None if value is None else str(value)
+
+
+def _new_buffer(kind, size):
+    """数值列用float64数组，其余用预分配的object数组"""
+    if kind in ('float', 'int'):
+        return np.full(size, np.nan, dtype=np.float64)
+    return np.empty(size, dtype=object)
+
+
+class ColumnarRecordBuilder:
+    """按列缓冲榜单记录，攒满chunk_size行就追加写入CSV或Parquet
+
+    每列是预先分配好的数组，写出后复用，内存占用只与chunk_size有关，
+    与爬取的年份、页数无关。
+    行按 add 的顺序写出，不再排序；需要按排名输出时由调用方按排名顺序添加
+    （见 HurunHistoryStore.export）。
+    """
+
+    def __init__(self, path, schema=SCHEMA, chunk_size=1000):
+        self.path = str(path)
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.is_parquet = self.path.endswith('.parquet')
+        self.getters = [_make_getter(json_path) for _, json_path, _ in schema]
+        self.buffers = [_new_buffer(kind, chunk_size) for _, _, kind in schema]
+        self.size = 0
+        self.rows_written = 0
+        self._writer = None
+
+    def add(self, item):
+        """追加一条原始JSON记录"""
+        i = self.size
+        for (_, _, kind), get, buffer in zip(self.schema, self.getters, self.buffers):
+            value = get(item)
+            buffer[i] = _to_float(value) if kind in ('float', 'int') else _to_text(value)
+        self.size += 1
+        if self.size == self.chunk_size:
+            self.flush()
+
+    def extend(self, items):
+        for item in items:
+            self.add(item)
+
+    def to_frame(self):
+        """把当前缓冲区转为带类型的DataFrame"""
+        n = self.size
+        columns = {}
+        for (name, _, kind), buffer in zip(self.schema, self.buffers):
+            values = buffer[:n]
+            if kind == 'int':
+                columns[name] = pd.array(values, dtype='Float64').astype('Int64')
+            elif kind == 'category':
+                columns[name] = pd.Categorical(values)
+            else:
+                columns[name] = values.copy()
+        return pd.DataFrame(columns)
+
+    def flush(self):
+        """写出缓冲区中的数据并清空"""
+        if self.size == 0:
+            return
+        df = self.to_frame()
+        if self.is_parquet:
+            self._write_parquet(df)
+        elif self.rows_written == 0:
+            df.to_csv(self.path, index=False, header=True, encoding='utf_8_sig')
+        else:
+            df.to_csv(self.path, index=False, header=False, mode='a', encoding='utf-8')
+        self.rows_written += self.size
+        self.size = 0
+        for buffer in self.buffers:
+            buffer.fill(np.nan if buffer.dtype == np.float64 else None)
+
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._arrow_schema = pa.schema([(name, _arrow_type(kind)) for name, _, kind in self.schema])
+            self._writer = pq.ParquetWriter(self.path, self._arrow_schema)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        self._writer.write_table(table.cast(self._arrow_schema))
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _arrow_type(kind):
+    import pyarrow as pa
+
+    return {
+        'str': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'float': pa.float64(),
+        'int': pa.int64(),
+    }[kind]
@@ -0,0 +1,114 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+BASE_URL = 'https://www.hurun.net'
+LIST_PATH = '/zh-CN/Rank/HsRankDetailsList'
+DEFAULT_NUM = 'ODBYW2BI'  # 2024胡润百富榜的榜单编号
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36 Edg/110.0.1587.50',
+    'accept': 'application/json, text/javascript, */*; q=0.01',
+    'accept-language': 'zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7',
+    'accept-encoding': 'gzip, deflate',
+    'content-type': 'application/json',
+    'referer': 'https://www.hurun.net/zh-CN/Rank/HsRankDetails?pagetype=rich'
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def page_params(page, num=DEFAULT_NUM, limit=200):
+    """第page页（从1开始）对应的查询参数"""
+    return {'num': num, 'search': '', 'offset': (page - 1) * limit, 'limit': limit}
+
+
+class TokenBucket:
+    """令牌桶限速：平均每秒发放rate个令牌，最多积攒burst个"""
+
+    def __init__(self, rate=1.0, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """取一个令牌，令牌不足时等待到有为止"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def retry_delay(attempt, retry_after=None, backoff=1.0, max_backoff=30.0):
+    """第 attempt 次（从0开始）失败后等待的秒数：有 Retry-After 时照办，否则指数退避加随机抖动"""
+    if retry_after is not None and retry_after.isdigit():
+        return min(float(retry_after), max_backoff)
+    return min(backoff * 2 ** attempt, max_backoff) * random.uniform(0.5, 1.0)
+
+
+async def _fetch_page(session, bucket, semaphore, base_url, num, page, limit, retries=3):
+    """请求单页，返回(榜单编号, 页码, rows)
+
+    429/5xx、连接错误和超时最多重试 retries 次；等待重试时不占用并发名额。
+    """
+    for attempt in range(retries + 1):
+        retry_after = None
+        async with semaphore:
+            await bucket.acquire()
+            print('开始爬取第{}页（榜单{}）'.format(page, num))
+            try:
+                async with session.get(base_url + LIST_PATH, params=page_params(page, num, limit)) as r:
+                    if r.status in RETRY_STATUSES and attempt < retries:
+                        retry_after = r.headers.get('Retry-After')
+                        error = '状态码{}'.format(r.status)
+                    else:
+                        r.raise_for_status()
+                        json_data = await r.json(content_type=None)
+                        return num, page, json_data['rows']
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == retries:
+                    raise
+                error = repr(e)
+        print('第{}页（榜单{}）失败：{}，第{}次重试'.format(page, num, error, attempt + 1))
+        await asyncio.sleep(retry_delay(attempt, retry_after))
+
+
+async def iter_pages(pages, nums=(DEFAULT_NUM,), limit=200, concurrency=4, rate=2.0, burst=2,
+                     base_url=BASE_URL, timeout=30, retries=3):
+    """并发请求多个榜单的多页数据，哪一页先到就先产出哪一页
+
+    concurrency 限制同时在途的请求数，rate/burst 为令牌桶参数（每秒请求数/突发数），
+    所有请求共用一个保持长连接的连接池；单页的临时失败按 retries 重试（见 _fetch_page）。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, burst)
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=client_timeout) as session:
+        tasks = [asyncio.create_task(_fetch_page(session, bucket, semaphore, base_url, num, page, limit, retries))
+                 for num in nums for page in pages]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            # 出错或提前退出时取消剩余请求，并等它们结束后再关闭会话
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def crawl(pages, on_page, **kwargs):
+    """同步入口：每到达一页就调用 on_page(num, page, rows)，参数同 iter_pages"""
+
+    async def _run():
+        async for num, page, rows in iter_pages(pages, **kwargs):
+            on_page(num, page, rows)
+
+    asyncio.run(_run())
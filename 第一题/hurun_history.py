@@ -0,0 +1,117 @@
+import hashlib
+import json
+import sqlite3
+
+from hurun_columns import ColumnarRecordBuilder
+
+DEFAULT_DB = 'hurun_history.sqlite'
+
+
+def page_digest(rows):
+    """一页rows的内容哈希（键排序后序列化，与字段顺序无关）"""
+    text = json.dumps(rows, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def person_key(item):
+    """同一榜单年份内区分人物：中文名 + 英文名"""
+    character = item['hs_Character'][0]
+    return '{}|{}'.format(character.get('hs_Character_Fullname_Cn') or '',
+                          character.get('hs_Character_Fullname_En') or '')
+
+
+class HurunHistoryStore:
+    """多年份胡润榜单的本地SQLite存储，以 (年份, 人物) 为主键
+
+    重复爬取时：内容哈希未变的页直接跳过；其余页只写入排名或财富值有变化的行，
+    写入量与变化量成正比，而不是与榜单总量成正比。
+    每行记录它最后出现在哪一页；某页内容变化时整页替换：原来在这一页、本次不在的人物被删除
+    （跌出榜单的人物不会残留），移到别页的人物由那一页重新写入。
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS page_hashes (
+                num TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (num, page)
+            );
+            CREATE TABLE IF NOT EXISTS rich_list (
+                year INTEGER NOT NULL,
+                person TEXT NOT NULL,
+                ranking INTEGER,
+                wealth REAL,
+                raw TEXT NOT NULL,
+                num TEXT,
+                page INTEGER,
+                PRIMARY KEY (year, person)
+            );
+        ''')
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(rich_list)')]
+        if 'page' not in columns:
+            # 旧库的行不知道来自哪一页：补上列并清空页哈希，下次爬取时每页都重新写入
+            with self.conn:
+                self.conn.execute('ALTER TABLE rich_list ADD COLUMN num TEXT')
+                self.conn.execute('ALTER TABLE rich_list ADD COLUMN page INTEGER')
+                self.conn.execute('DELETE FROM page_hashes')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS rich_list_page ON rich_list(num, page)')
+        self.changed_years = set()
+
+    def page_unchanged(self, num, page, digest):
+        row = self.conn.execute('SELECT digest FROM page_hashes WHERE num = ? AND page = ?',
+                                (num, page)).fetchone()
+        return row is not None and row[0] == digest
+
+    def ingest_page(self, num, page, rows):
+        """写入一页数据，返回实际写入（新增或变化）的行数"""
+        digest = page_digest(rows)
+        if self.page_unchanged(num, page, digest):
+            print('第{}页（榜单{}）内容未变化，跳过'.format(page, num))
+            return 0
+
+        records = [(int(item['hs_Rank_Rich_Year']), person_key(item), item) for item in rows]
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO rich_list (year, person, ranking, wealth, raw, num, page)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (year, person) DO UPDATE SET
+                    ranking = excluded.ranking,
+                    wealth = excluded.wealth,
+                    raw = excluded.raw,
+                    num = excluded.num,
+                    page = excluded.page
+                WHERE ranking IS NOT excluded.ranking OR wealth IS NOT excluded.wealth
+                    OR num IS NOT excluded.num OR page IS NOT excluded.page
+            ''', ((year, person, item['hs_Rank_Rich_Ranking'], item['hs_Rank_Rich_Wealth'],
+                   json.dumps(item, ensure_ascii=False), num, page) for year, person, item in records))
+            # 这一页原有、本次不在的人物：整页按新内容替换
+            present = {(year, person) for year, person, _ in records}
+            stale = [(year, person) for year, person in self.conn.execute(
+                'SELECT year, person FROM rich_list WHERE num = ? AND page = ?', (num, page))
+                     if (year, person) not in present]
+            self.conn.executemany('DELETE FROM rich_list WHERE year = ? AND person = ?', stale)
+            written = self.conn.total_changes - before
+            self.conn.execute('INSERT OR REPLACE INTO page_hashes (num, page, digest) VALUES (?, ?, ?)',
+                              (num, page, digest))
+        if written:
+            self.changed_years.update(year for year, _, _ in records)
+            self.changed_years.update(year for year, _ in stale)
+        return written
+
+    def export(self, year, path, chunk_size=1000):
+        """按排名顺序把某一年的榜单流式导出为CSV或Parquet，返回导出行数
+
+        与原来的 sort_values('排名', kind='stable') 一致：没有排名的行排在最后，同名次按入库顺序。
+        """
+        cursor = self.conn.execute('SELECT raw FROM rich_list WHERE year = ? ORDER BY ranking IS NULL, ranking, rowid',
+                                   (year,))
+        with ColumnarRecordBuilder(path, chunk_size=chunk_size) as builder:
+            for (raw,) in cursor:
+                builder.add(json.loads(raw))
+        return builder.rows_written
+
+    def close(self):
+        self.conn.close()
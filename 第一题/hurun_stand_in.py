@@ -0,0 +1,41 @@
+"""本地胡润榜单接口替身：按 num/offset/limit 返回预先准备好的JSON，用于离线测试爬虫
+
+用法：
+    python hurun_stand_in.py canned_pages/ 8765
+    # 然后在爬虫中传入 base_url='http://127.0.0.1:8765'
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+from hurun_fetcher import LIST_PATH
+
+
+def load_canned_rows(directory):
+    """读取目录下的 {num}.json 文件，每个文件是该榜单的完整rows列表"""
+    return {path.stem: json.loads(path.read_text(encoding='utf-8'))
+            for path in Path(directory).glob('*.json')}
+
+
+def make_app(rows_by_num, delay=0.0):
+    """rows_by_num: {榜单编号: [row, ...]}；delay 模拟网络延迟（秒）"""
+
+    async def handler(request):
+        if delay:
+            await asyncio.sleep(delay)
+        rows = rows_by_num.get(request.query.get('num'), [])
+        offset = int(request.query.get('offset', 0))
+        limit = int(request.query.get('limit', 200))
+        return web.json_response({'total': len(rows), 'rows': rows[offset:offset + limit]})
+
+    app = web.Application()
+    app.router.add_get(LIST_PATH, handler)
+    return app
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    web.run_app(make_app(load_canned_rows(sys.argv[1])), host='127.0.0.1', port=port)
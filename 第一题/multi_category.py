@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+# 行业统计输出列名
+STAT_COLUMNS = {
+    'size': '富豪数量',
+    'sum': '财富总和(亿)',
+    'mean': '平均财富(亿)',
+    'median': '财富中位数(亿)',
+}
+
+
+def split_categories(series, sep='、'):
+    """把"饮料、医疗保健"这类多值字段拆成一行一个值（保留原索引）"""
+    values = series.str.split(sep).explode().str.strip()
+    return values[values.notna() & (values != '')]
+
+
+def explode_categories(df, column, sep='、', name='行业'):
+    """向量化拆分多值列：每个值一行，其余列随之复制"""
+    values = split_categories(df[column], sep)
+    return df.drop(columns=[column]).join(values.rename(name), how='inner')
+
+
+def category_stats(exploded, category='行业', value='财富值_人民币_亿'):
+    """一次groupby同时算出人数、财富总和、平均值、中位数，按人数降序"""
+    stats = exploded.groupby(category, observed=True)[value].agg(list(STAT_COLUMNS))
+    return stats.rename(columns=STAT_COLUMNS).sort_values('富豪数量', ascending=False, kind='stable')
+
+
+def incidence_matrix(df, column, sep='、'):
+    """行业×人物 0/1 稀疏关联矩阵，返回 (csr_matrix, 行业标签)
+
+    matrix @ matrix.T 即为行业共现次数矩阵。
+    """
+    from scipy import sparse
+
+    values = split_categories(df[column].reset_index(drop=True), sep)
+    codes, labels = pd.factorize(values)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes), dtype=np.int32), (codes, values.index.to_numpy())),
+        shape=(len(labels), len(df))
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1  # 同一人重复填写同一行业只算一次
+    return matrix, pd.Index(labels, name=column)
+
+
+def co_occurrence(matrix, labels):
+    """行业两两共现的人数，返回DataFrame（对角线为行业人数）"""
+    counts = (matrix @ matrix.T).toarray()
+    return pd.DataFrame(counts, index=labels, columns=labels)
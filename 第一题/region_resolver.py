@@ -0,0 +1,112 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+PROVINCES = ['北京', '天津', '上海', '重庆', '河北', '山西', '辽宁', '吉林', '黑龙江', '江苏', '浙江', '安徽',
+             '福建', '江西', '山东', '河南', '湖北', '湖南', '广东', '海南', '四川', '贵州', '云南', '陕西',
+             '甘肃', '青海', '台湾', '内蒙古', '广西', '西藏', '宁夏', '新疆', '香港', '澳门']
+# 直辖市和特别行政区：城市级别直接使用省级名称
+MUNICIPALITIES = {'北京', '天津', '上海', '重庆', '香港', '澳门'}
+# 省级名称后面可能跟着的行政区划后缀和分隔符
+_PROVINCE_SUFFIXES = ('维吾尔自治区', '壮族自治区', '回族自治区', '特别行政区', '自治区', '省', '市')
+_SEPARATORS = '-— /·,，'
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配：一次扫描文本即可找出所有关键词"""
+
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]  # 以该状态结尾的最长关键词
+        self.max_len = max((len(word) for word in words), default=0)
+        for word in words:
+            self._insert(word)
+        self._build()
+
+    def _insert(self, word):
+        state = 0
+        for char in word:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state] = word
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.output[child] is None:
+                    self.output[child] = self.output[self.fail[child]]
+
+    def find_first(self, text):
+        """返回最靠左的匹配 (起始位置, 关键词)，没有匹配时返回None"""
+        state = 0
+        best = None
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            word = self.output[state]
+            if word is not None:
+                start = end - len(word) + 1
+                if best is None or start < best[0]:
+                    best = (start, word)
+            if best is not None and end - best[0] >= self.max_len:
+                break  # 之后的匹配不可能比已找到的更靠左
+        return best
+
+
+_PROVINCE_MATCHER = AhoCorasick(PROVINCES)
+
+
+def resolve_address(address):
+    """解析单个出生地，返回 (省份, 城市)，如"中国-福建-龙岩" -> ("福建", "龙岩")"""
+    if not isinstance(address, str):
+        return None, None
+    match = _PROVINCE_MATCHER.find_first(address)
+    if match is None:
+        return None, None
+    start, province = match
+    if province in MUNICIPALITIES:
+        return province, province
+
+    rest = address[start + len(province):]
+    for suffix in _PROVINCE_SUFFIXES:
+        if rest.startswith(suffix):
+            rest = rest[len(suffix):]
+            break
+    rest = rest.lstrip(_SEPARATORS)
+    for sep in _SEPARATORS:
+        rest = rest.split(sep)[0]
+    city = rest.removesuffix('市').strip()
+    return province, city or None
+
+
+def resolve_regions(addresses):
+    """批量解析出生地列，返回含"省份"、"城市"两列（普通字符串列，不是分类类型）的DataFrame
+
+    先按类别去重，只对不同的地址做匹配，再通过类别编码映射回每一行，
+    开销与不同地址的个数成正比，而不是与行数成正比。
+    结果不做成分类类型：分类列的 value_counts() 会带上计数为0的类别、按类别顺序排列，
+    直接拿去画图时柱子和标签对不上；需要分类类型时由调用方自行转换。
+    """
+    categorical = pd.Categorical(addresses)
+    resolved = [resolve_address(address) for address in categorical.categories]
+    codes = categorical.codes
+    result = {}
+    for i, name in enumerate(['省份', '城市']):
+        # 在末尾追加一个None，让缺失值的编码 -1 正好取到它
+        lookup = np.array([pair[i] for pair in resolved] + [None], dtype=object)
+        result[name] = lookup[codes]
+    return pd.DataFrame(result, index=getattr(addresses, 'index', None))
@@ -0,0 +1,64 @@
+"""年龄-财富散点图的细节层级（LOD）
+
+行数不超过阈值时原样画出全部点；超过阈值时二选一：
+    sample  分层抽样：财富前top_n名全部保留，其余按性别分层等比例抽样到固定点数
+    density 二维直方图：预先聚合为固定大小的网格，绘图只画网格
+两种方式交给绘图进程的数据量都有上限，渲染耗时基本不随行数增长。
+"""
+import numpy as np
+import pandas as pd
+
+X, Y, HUE = '年龄', '财富值_人民币_亿', '性别'
+LOD_THRESHOLD = 5000
+SAMPLE_SIZE = 3000
+TOP_N = 100
+GRID_BINS = 40
+
+
+def stratified_sample(df, size=SAMPLE_SIZE, top_n=TOP_N, strata=HUE, value=Y, seed=0):
+    """保留财富前top_n名，其余行按strata分层等比例抽样，共约size行"""
+    if len(df) <= size:
+        return df
+    top = df.nlargest(top_n, value)
+    rest = df.drop(top.index)
+    fraction = max(size - len(top), 0) / len(rest)
+    sampled = (rest.groupby(strata, observed=True, group_keys=False, dropna=False)
+               .sample(frac=fraction, random_state=seed))
+    return pd.concat([top, sampled])
+
+
+def density_grid(df, bins=GRID_BINS):
+    """年龄×财富（对数刻度）二维直方图，返回包含全部网格单元的长表"""
+    data = df[[X, Y]].dropna()
+    data = data[data[Y] > 0]
+    x_min, x_max = data[X].min(), data[X].max()
+    y_min, y_max = data[Y].min(), data[Y].max()
+    # 取值全部相同时范围宽度为0，网格边界不递增，histogram2d 会报错；向两侧稍微展开
+    if x_min == x_max:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_min == y_max:
+        y_min, y_max = y_min / 1.01, y_max * 1.01
+    x_edges = np.linspace(x_min, x_max, bins + 1)
+    y_edges = np.geomspace(y_min, y_max, bins + 1)
+    counts, _, _ = np.histogram2d(data[X], data[Y], bins=[x_edges, y_edges])
+    xi, yi = np.meshgrid(np.arange(bins), np.arange(bins), indexing='ij')
+    return pd.DataFrame({
+        '年龄_左': x_edges[xi.ravel()],
+        '年龄_右': x_edges[xi.ravel() + 1],
+        '财富_下': y_edges[yi.ravel()],
+        '财富_上': y_edges[yi.ravel() + 1],
+        '人数': counts.ravel(),
+    })
+
+
+def plan_scatter(df, threshold=LOD_THRESHOLD, mode='sample'):
+    """返回 (绘图类型, 绘图数据)；均值和总行数按全部数据计算，放在 attrs 中"""
+    data = df[[X, Y, HUE]]
+    if len(data) <= threshold:
+        kind = 'age_wealth_scatter'
+    elif mode == 'density':
+        kind, data = 'age_wealth_density', density_grid(data)
+    else:
+        kind, data = 'age_wealth_scatter', stratified_sample(data)
+    data.attrs = {'mean_age': df[X].mean(), 'mean_wealth': df[Y].mean(), 'total': len(df)}
+    return kind, data